@@ -6,18 +6,27 @@ import time
 from datetime import datetime
 import logging
 
+import orjson
+
 from langchain.prompts import PromptTemplate
 from langchain_community.llms import Ollama
 from sentence_transformers import SentenceTransformer
 
+from agents.base_simple import LLM_SLOTS
 from models.agent import AgentResult, HighlightedSource, MissingInfo
 from utils.text_processing import find_relevant_sentences, calculate_sentence_relevance
 
 logger = logging.getLogger(__name__)
 
+# Appended to the prompt when the first response is not valid JSON
+JSON_RETRY_INSTRUCTION = "\n\nReturn ONLY valid JSON."
+
 class BaseAgent(ABC):
     """Base class for all BT-RADS agents"""
     
+    # Same limiter as SimpleBaseAgent, so the cap holds across both bases
+    _llm_slots = LLM_SLOTS
+    
     def __init__(
         self,
         agent_id: str,
@@ -31,12 +40,14 @@ class BaseAgent(ABC):
         self.llm_model = llm_model
         self.temperature = temperature
         
-        # Initialize LLM
+        # Initialize LLM; JSON mode constrains decoding to valid JSON so the
+        # parsers don't have to fall back on free-form text
         self.llm = Ollama(
             model=llm_model,
             temperature=temperature,
             num_ctx=8192,
-            num_predict=512
+            num_predict=512,
+            format="json"
         )
         
         # Initialize embedding model for source highlighting
@@ -73,18 +84,27 @@ class BaseAgent(ABC):
         patient_id: str
     ) -> AgentResult:
         """Main extraction method"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             # Prepare the prompt
             prompt = self._prepare_prompt(clinical_note, context)
             
             # Get LLM response
-            logger.info(f"{self.agent_id} processing patient {patient_id}")
+            logger.info("%s processing patient %s", self.agent_id, patient_id)
             response = await self._get_llm_response(prompt)
             
+            # Retry once with a stricter instruction rather than letting the
+            # parser fall back to a low-confidence guess
+            retried = not self._is_json_response(response)
+            if retried:
+                logger.warning("%s returned invalid JSON, retrying", self.agent_id)
+                response = await self._get_llm_response(prompt + JSON_RETRY_INSTRUCTION)
+            
             # Parse response
             extracted_value, reasoning, confidence = self._parse_llm_response(response)
+            if retried:
+                confidence = min(confidence, 0.5)
             
             # Validate extraction
             is_valid = self._validate_extraction(extracted_value, context)
@@ -116,19 +136,19 @@ class BaseAgent(ABC):
                 reasoning=reasoning,
                 source_highlights=source_highlights,
                 missing_info=missing_info,
-                processing_time_ms=int((time.time() - start_time) * 1000),
+                processing_time_ms=int((time.perf_counter() - start_time) * 1000),
                 llm_model=self.llm_model
             )
             
             logger.info(
-                f"{self.agent_id} completed: value={extracted_value}, "
-                f"confidence={confidence:.2f}, time={result.processing_time_ms}ms"
+                "%s completed: value=%s, confidence=%.2f, time=%dms",
+                self.agent_id, extracted_value, confidence, result.processing_time_ms
             )
             
             return result
             
         except Exception as e:
-            logger.error(f"{self.agent_id} error: {str(e)}")
+            logger.error("%s error: %s", self.agent_id, e)
             # Return error result
             return AgentResult(
                 agent_id=self.agent_id,
@@ -145,7 +165,7 @@ class BaseAgent(ABC):
                     clinical_impact="Cannot proceed with this node",
                     suggested_fallback="Manual review required"
                 )],
-                processing_time_ms=int((time.time() - start_time) * 1000),
+                processing_time_ms=int((time.perf_counter() - start_time) * 1000),
                 llm_model=self.llm_model
             )
     
@@ -158,15 +178,27 @@ class BaseAgent(ABC):
         }
         return self.extraction_prompt.format(**prompt_vars)
     
+    @staticmethod
+    def _is_json_response(response: str) -> bool:
+        """Check whether the response contains a parseable JSON object"""
+        # Cheap completeness guard: skip the parse when there is no closing
+        # brace after the first opening one (e.g. truncated output)
+        start = response.find('{')
+        end = response.rfind('}')
+        if start == -1 or end < start:
+            return False
+        try:
+            orjson.loads(response[start:end + 1])
+        except orjson.JSONDecodeError:
+            return False
+        return True
+    
     async def _get_llm_response(self, prompt: str) -> str:
         """Get response from LLM"""
-        # Run in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: self.llm.invoke(prompt)
-        )
-        return response
+        # The Ollama client's async path talks to the server over aiohttp,
+        # so concurrent calls don't each hold a thread-pool worker
+        async with self._llm_slots:
+            return await self.llm.ainvoke(prompt)
     
     async def _find_source_highlights(
         self,
@@ -1,9 +1,10 @@
 """Simplified base agent class for BT-RADS system"""
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import asyncio
+import os
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 import json
 
@@ -11,9 +12,74 @@ from models.agent import AgentResult, HighlightedSource
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on LLM requests in flight across all agents and patients;
+# keep in line with the server's OLLAMA_NUM_PARALLEL
+MAX_CONCURRENT_LLM = int(os.getenv("MAX_CONCURRENT_LLM", "8"))
+LLM_SLOTS = asyncio.Semaphore(MAX_CONCURRENT_LLM)
+
 class SimpleBaseAgent(ABC):
     """Simplified base class for BT-RADS agents"""
     
+    # Mock LLM output per agent, built once rather than on every _call_llm
+    _MOCK_RESPONSES = {
+        "prior-assessment": {
+            "has_prior": True,
+            "confidence": 0.85,
+            "reasoning": "Found mention of prior imaging",
+            "evidence_sentences": ["Prior MRI from 6 months ago shows..."]
+        },
+        "imaging-comparison": {
+            "volume_change": 25.5,
+            "change_type": "increase",
+            "confidence": 0.9,
+            "reasoning": "Clear volume measurements provided",
+            "evidence_sentences": ["FLAIR volume increased by 25.5%"]
+        },
+        "medication-status": {
+            "on_medication": True,
+            "medication_type": "corticosteroids",
+            "confidence": 0.8,
+            "reasoning": "Patient on dexamethasone",
+            "evidence_sentences": ["Currently on dexamethasone 4mg daily"]
+        },
+        "radiation-timeline": {
+            "radiation_date_str": "2024-01-15",
+            "radiation_type": "stereotactic radiosurgery",
+            "confidence": 0.9,
+            "reasoning": "Found radiation date",
+            "evidence_sentences": ["Completed SRS on January 15, 2024"]
+        },
+        "component-analysis": {
+            "enhancement_pattern": "peripheral",
+            "necrosis_present": True,
+            "confidence": 0.85,
+            "reasoning": "Peripheral enhancement with central necrosis",
+            "evidence_sentences": ["Shows peripheral enhancement with central necrosis"]
+        },
+        "extent-analysis": {
+            "extent": "multifocal",
+            "locations": ["frontal", "parietal"],
+            "confidence": 0.9,
+            "reasoning": "Multiple lesions noted",
+            "evidence_sentences": ["Multifocal lesions in frontal and parietal lobes"]
+        },
+        "progression-pattern": {
+            "pattern": "local",
+            "confidence": 0.85,
+            "reasoning": "Progression at treatment site",
+            "evidence_sentences": ["Local progression at the treatment site"]
+        }
+    }
+    
+    _DEFAULT_MOCK_RESPONSE = {
+        "confidence": 0.5,
+        "reasoning": "Default mock response",
+        "evidence_sentences": []
+    }
+    
+    # Shared by every agent instance
+    _llm_slots = LLM_SLOTS
+    
     def __init__(
         self,
         agent_id: str,
@@ -34,66 +100,37 @@ class SimpleBaseAgent(ABC):
         """Main extraction method - must be implemented by each agent"""
         pass
     
+    @staticmethod
+    async def extract_batch(
+        agents: Dict[str, "SimpleBaseAgent"],
+        clinical_note: str,
+        context: Dict[str, Any],
+        patient_id: str
+    ) -> Dict[str, AgentResult]:
+        """Run several agents on the same note concurrently so their LLM
+        calls are in flight together instead of one at a time"""
+        batch_context = {**context, "batch_timestamp": datetime.now(timezone.utc)}
+        # A TaskGroup cancels the remaining extractions if one fails or the
+        # caller is cancelled, so no orphaned LLM calls are left running
+        async with asyncio.TaskGroup() as tg:
+            tasks = {
+                name: tg.create_task(agent.extract(
+                    clinical_note=clinical_note,
+                    context=batch_context,
+                    patient_id=patient_id
+                ))
+                for name, agent in agents.items()
+            }
+        return {name: task.result() for name, task in tasks.items()}
+    
     async def _call_llm(self, prompt: str) -> Dict[str, Any]:
         """Mock LLM call for now - returns structured data"""
         # In production, this would call Ollama
         # For now, return mock data based on the agent type
-        mock_responses = {
-            "prior-assessment": {
-                "has_prior": True,
-                "confidence": 0.85,
-                "reasoning": "Found mention of prior imaging",
-                "evidence_sentences": ["Prior MRI from 6 months ago shows..."]
-            },
-            "imaging-comparison": {
-                "volume_change": 25.5,
-                "change_type": "increase",
-                "confidence": 0.9,
-                "reasoning": "Clear volume measurements provided",
-                "evidence_sentences": ["FLAIR volume increased by 25.5%"]
-            },
-            "medication-status": {
-                "on_medication": True,
-                "medication_type": "corticosteroids",
-                "confidence": 0.8,
-                "reasoning": "Patient on dexamethasone",
-                "evidence_sentences": ["Currently on dexamethasone 4mg daily"]
-            },
-            "radiation-timeline": {
-                "radiation_date_str": "2024-01-15",
-                "radiation_type": "stereotactic radiosurgery",
-                "confidence": 0.9,
-                "reasoning": "Found radiation date",
-                "evidence_sentences": ["Completed SRS on January 15, 2024"]
-            },
-            "component-analysis": {
-                "enhancement_pattern": "peripheral",
-                "necrosis_present": True,
-                "confidence": 0.85,
-                "reasoning": "Peripheral enhancement with central necrosis",
-                "evidence_sentences": ["Shows peripheral enhancement with central necrosis"]
-            },
-            "extent-analysis": {
-                "extent": "multifocal",
-                "locations": ["frontal", "parietal"],
-                "confidence": 0.9,
-                "reasoning": "Multiple lesions noted",
-                "evidence_sentences": ["Multifocal lesions in frontal and parietal lobes"]
-            },
-            "progression-pattern": {
-                "pattern": "local",
-                "confidence": 0.85,
-                "reasoning": "Progression at treatment site",
-                "evidence_sentences": ["Local progression at the treatment site"]
-            }
-        }
-        
-        await asyncio.sleep(0.5)  # Simulate processing time
-        return mock_responses.get(self.agent_id, {
-            "confidence": 0.5,
-            "reasoning": "Default mock response",
-            "evidence_sentences": []
-        })
+        async with self._llm_slots:
+            await asyncio.sleep(0.5)  # Simulate processing time
+        # Copy so agents can adjust the response without touching the shared table
+        return dict(self._MOCK_RESPONSES.get(self.agent_id, self._DEFAULT_MOCK_RESPONSE))
     
     async def _highlight_sources(
         self,
@@ -101,21 +138,62 @@ class SimpleBaseAgent(ABC):
         evidence_sentences: List[str]
     ) -> List[HighlightedSource]:
         """Find source highlights in the clinical note"""
-        highlights = []
+        # Nothing to match (e.g. LLM failure default)
+        if not evidence_sentences:
+            return []
+        
+        # A few str.find calls are cheaper than a thread hop, so match inline
+        spans = self._find_source_spans(clinical_note, evidence_sentences)
+        
+        return [
+            HighlightedSource(
+                text=sentence,
+                start_char=start,
+                end_char=end,
+                confidence=0.9
+            )
+            for sentence, start, end in spans
+        ]
+    
+    @staticmethod
+    def _find_source_spans(
+        clinical_note: str,
+        evidence_sentences: List[str]
+    ) -> List[Tuple[str, int, int]]:
+        """Locate evidence sentences in the note (pure, no I/O)"""
+        spans = []
         
         for sentence in evidence_sentences:
             # Simple substring search for now
-            if sentence in clinical_note:
-                start = clinical_note.find(sentence)
-                end = start + len(sentence)
-                highlights.append(HighlightedSource(
-                    text=sentence,
-                    start_char=start,
-                    end_char=end,
-                    confidence=0.9
-                ))
+            start = clinical_note.find(sentence)
+            if start != -1:
+                spans.append((sentence, start, start + len(sentence)))
         
-        return highlights
+        return spans
+    
+    @staticmethod
+    def _get_confidence(response: Dict[str, Any], default: float) -> float:
+        """Confidence from a parsed LLM response, clamped to [0, 1]"""
+        confidence = response.get("confidence", default)
+        # JSON numbers already parse to int/float; only convert anything else
+        # (e.g. "0.8" or null), falling back to the default
+        if type(confidence) not in (int, float):
+            try:
+                confidence = float(confidence)
+            except (TypeError, ValueError):
+                return default
+        if confidence != confidence:  # NaN slips through the clamp below
+            return default
+        if confidence > 1.0:
+            return 1.0
+        if confidence < 0.0:
+            return 0.0
+        return confidence
+    
+    @staticmethod
+    def _result_timestamp(context: Dict[str, Any]) -> datetime:
+        """Timestamp for a result; batch callers share one via context["batch_timestamp"]"""
+        return context.get("batch_timestamp") or datetime.now(timezone.utc)
     
     def _create_error_result(self, patient_id: str, error_msg: str) -> AgentResult:
         """Create an error result"""
@@ -123,7 +201,7 @@ class SimpleBaseAgent(ABC):
             agent_id=self.agent_id,
             patient_id=patient_id,
             node_id=self.agent_id,
-            timestamp=datetime.utcnow(),
+            timestamp=datetime.now(timezone.utc),
             extracted_value={"error": True, "message": error_msg},
             confidence=0.0,
             reasoning=f"Error: {error_msg}",
@@ -2,13 +2,33 @@
 from typing import Dict, Any
 import logging
 import time
-from datetime import datetime
 
 from agents.base_simple import SimpleBaseAgent
 from models.agent import AgentResult
 
 logger = logging.getLogger(__name__)
 
+EXTRACTION_INSTRUCTIONS = """\
+Analyze the imaging component changes described in the clinical note below.
+
+Task: Extract descriptions of how the FLAIR and enhancement components changed.
+Look for:
+- Descriptions of FLAIR signal changes
+- Descriptions of enhancement patterns
+- Any mentions of which component is dominant
+- Qualitative assessments of changes
+
+Return JSON format:
+{
+    "component_description": "description of component changes",
+    "flair_description": "specific FLAIR changes if mentioned",
+    "enhancement_description": "specific enhancement changes if mentioned",
+    "evidence_sentences": ["list of relevant sentences"],
+    "confidence": 0.0-1.0,
+    "reasoning": "brief explanation"
+}
+"""
+
 class ComponentAnalysisAgent(SimpleBaseAgent):
     """Agent responsible for analyzing enhancement and FLAIR components"""
     
@@ -21,40 +41,20 @@ class ComponentAnalysisAgent(SimpleBaseAgent):
     
     async def extract(self, clinical_note: str, context: Dict[str, Any], patient_id: str) -> AgentResult:
         """Extract component analysis from clinical note"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             # Get change data from context
             flair_change = context.get("flair_change_percentage", 0)
             enhancement_change = context.get("enhancement_change_percentage", 0)
             
             # Create prompt for component analysis
-            prompt = f"""
-            Analyze the imaging component changes described in this clinical note.
-            
-            Clinical Note:
-            {clinical_note}
-            
-            Known measurements:
-            - FLAIR change: {flair_change:.1f}%
-            - Enhancement change: {enhancement_change:.1f}%
-            
-            Task: Extract descriptions of how the FLAIR and enhancement components changed.
-            Look for:
-            - Descriptions of FLAIR signal changes
-            - Descriptions of enhancement patterns
-            - Any mentions of which component is dominant
-            - Qualitative assessments of changes
-            
-            Return JSON format:
-            {{
-                "component_description": "description of component changes",
-                "flair_description": "specific FLAIR changes if mentioned",
-                "enhancement_description": "specific enhancement changes if mentioned",
-                "evidence_sentences": ["list of relevant sentences"],
-                "confidence": 0.0-1.0,
-                "reasoning": "brief explanation"
-            }}
-            """
+            prompt = (
+                f"{EXTRACTION_INSTRUCTIONS}\n"
+                "Known measurements:\n"
+                f"- FLAIR change: {flair_change:.1f}%\n"
+                f"- Enhancement change: {enhancement_change:.1f}%\n\n"
+                f"Clinical Note:\n{clinical_note}\n"
+            )
             
             # Get LLM response
             response = await self._call_llm(prompt)
@@ -85,15 +85,15 @@ class ComponentAnalysisAgent(SimpleBaseAgent):
                 response.get("evidence_sentences", [])
             )
             
-            processing_time = int((time.time() - start_time) * 1000)
+            processing_time = int((time.perf_counter() - start_time) * 1000)
             
             return AgentResult(
                 agent_id=self.agent_id,
                 patient_id=patient_id,
                 node_id="component_analysis",
-                timestamp=datetime.utcnow(),
+                timestamp=self._result_timestamp(context),
                 extracted_value=result_data,
-                confidence=response.get("confidence", 0.8),
+                confidence=self._get_confidence(response, 0.8),
                 reasoning=response.get("reasoning", ""),
                 source_highlights=source_highlights,
                 processing_time_ms=processing_time,
@@ -101,5 +101,5 @@ class ComponentAnalysisAgent(SimpleBaseAgent):
             )
             
         except Exception as e:
-            logger.error(f"Error in ComponentAnalysisAgent: {e}")
+            logger.error("Error in ComponentAnalysisAgent: %s", e)
             return self._create_error_result(patient_id, str(e))
\ No newline at end of file
@@ -2,13 +2,39 @@
 from typing import Dict, Any
 import logging
 import time
-from datetime import datetime
 
 from agents.base_simple import SimpleBaseAgent
 from models.agent import AgentResult
 
 logger = logging.getLogger(__name__)
 
+EXTRACTION_INSTRUCTIONS = """\
+Analyze the extent of changes described in the clinical note below.
+
+Task: Determine whether changes are localized or involve distant sites.
+Look for:
+- Mentions of multiple locations or sites
+- Words like "multifocal", "distant", "widespread", "disseminated"
+- Specific anatomical locations mentioned
+- Any indication of new lesions at distant sites
+
+A change is considered "distant" if:
+- New lesions appear at sites distant from the primary/original site
+- Multiple non-contiguous areas are involved
+- There's mention of disseminated or widespread disease
+
+Return JSON format:
+{
+    "is_localized": true/false,
+    "has_distant_sites": true/false,
+    "locations": ["list of anatomical locations mentioned"],
+    "extent_description": "description of extent",
+    "evidence_sentences": ["list of relevant sentences"],
+    "confidence": 0.0-1.0,
+    "reasoning": "brief explanation"
+}
+"""
+
 class ExtentAnalysisAgent(SimpleBaseAgent):
     """Agent responsible for analyzing extent of changes (localized vs distant)"""
     
@@ -21,38 +47,10 @@ class ExtentAnalysisAgent(SimpleBaseAgent):
     
     async def extract(self, clinical_note: str, context: Dict[str, Any], patient_id: str) -> AgentResult:
         """Extract extent analysis from clinical note"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             # Create prompt for extent analysis
-            prompt = f"""
-            Analyze the extent of changes described in this clinical note.
-            
-            Clinical Note:
-            {clinical_note}
-            
-            Task: Determine whether changes are localized or involve distant sites.
-            Look for:
-            - Mentions of multiple locations or sites
-            - Words like "multifocal", "distant", "widespread", "disseminated"
-            - Specific anatomical locations mentioned
-            - Any indication of new lesions at distant sites
-            
-            A change is considered "distant" if:
-            - New lesions appear at sites distant from the primary/original site
-            - Multiple non-contiguous areas are involved
-            - There's mention of disseminated or widespread disease
-            
-            Return JSON format:
-            {{
-                "is_localized": true/false,
-                "has_distant_sites": true/false,
-                "locations": ["list of anatomical locations mentioned"],
-                "extent_description": "description of extent",
-                "evidence_sentences": ["list of relevant sentences"],
-                "confidence": 0.0-1.0,
-                "reasoning": "brief explanation"
-            }}
-            """
+            prompt = f"{EXTRACTION_INSTRUCTIONS}\nClinical Note:\n{clinical_note}\n"
             
             # Get LLM response
             response = await self._call_llm(prompt)
@@ -75,15 +73,15 @@ class ExtentAnalysisAgent(SimpleBaseAgent):
                 response.get("evidence_sentences", [])
             )
             
-            processing_time = int((time.time() - start_time) * 1000)
+            processing_time = int((time.perf_counter() - start_time) * 1000)
             
             return AgentResult(
                 agent_id=self.agent_id,
                 patient_id=patient_id,
                 node_id="extent_analysis",
-                timestamp=datetime.utcnow(),
+                timestamp=self._result_timestamp(context),
                 extracted_value=result_data,
-                confidence=response.get("confidence", 0.75),
+                confidence=self._get_confidence(response, 0.75),
                 reasoning=response.get("reasoning", ""),
                 source_highlights=source_highlights,
                 processing_time_ms=processing_time,
@@ -91,5 +89,5 @@ class ExtentAnalysisAgent(SimpleBaseAgent):
             )
             
         except Exception as e:
-            logger.error(f"Error in ExtentAnalysisAgent: {e}")
+            logger.error("Error in ExtentAnalysisAgent: %s", e)
             return self._create_error_result(patient_id, str(e))
\ No newline at end of file
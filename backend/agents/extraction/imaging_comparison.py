@@ -2,13 +2,39 @@
 from typing import Dict, Any
 import logging
 import time
-from datetime import datetime
 
 from agents.base_simple import SimpleBaseAgent
 from models.agent import AgentResult
 
 logger = logging.getLogger(__name__)
 
+EXTRACTION_INSTRUCTIONS = """\
+You are a neuroradiology expert applying BT-RADS imaging assessment criteria using quantitative volume data.
+Your task is to compare current imaging with prior using both volume measurements and clinical descriptions.
+
+CRITICAL RULES:
+1. NEGATIVE percentage = DECREASED volume = IMPROVEMENT
+2. POSITIVE percentage = INCREASED volume = WORSENING  
+3. Values between -10% and +10% = STABLE/UNCHANGED
+4. ENHANCEMENT PRIORITY: When FLAIR and enhancement change in opposite directions, prioritize enhancement
+
+DECISION LOGIC:
+- Both decreased (negative %) -> "improved"
+- Both stable (±10%) -> "unchanged" 
+- Either shows significant increase (>10%) -> "worse"
+- Mixed pattern -> Follow enhancement direction
+
+Return JSON format:
+{
+    "assessment": "improved/unchanged/worse/unknown",
+    "reasoning": "explanation including volume analysis",
+    "confidence": 0.0-1.0,
+    "volume_pattern": "both_decreased/both_stable/both_increased/mixed",
+    "enhancement_priority_applied": true/false,
+    "evidence_sentences": ["relevant quotes"]
+}
+"""
+
 class ImagingComparisonAgent(SimpleBaseAgent):
     """Agent for comparing current imaging with prior (improved/unchanged/worse)"""
     
@@ -21,7 +47,7 @@ class ImagingComparisonAgent(SimpleBaseAgent):
     
     async def extract(self, clinical_note: str, context: Dict[str, Any], patient_id: str) -> AgentResult:
         """Extract imaging comparison from clinical note"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             # Get volume data from context
             flair_change_pct = context.get("flair_change_pct", 0)
@@ -30,41 +56,15 @@ class ImagingComparisonAgent(SimpleBaseAgent):
             followup_date = context.get("followup_date", "unknown")
             
             # Create prompt for imaging comparison
-            prompt = f"""
-            You are a neuroradiology expert applying BT-RADS imaging assessment criteria using quantitative volume data.
-            Your task is to compare current imaging with prior using both volume measurements and clinical descriptions.
-            
-            Clinical Note:
-            {clinical_note}
-            
-            VOLUME DATA:
-            - Baseline imaging: {baseline_date}
-            - Follow-up imaging: {followup_date}
-            - FLAIR volume change: {flair_change_pct}%
-            - Enhancement volume change: {enhancement_change_pct}%
-            
-            CRITICAL RULES:
-            1. NEGATIVE percentage = DECREASED volume = IMPROVEMENT
-            2. POSITIVE percentage = INCREASED volume = WORSENING  
-            3. Values between -10% and +10% = STABLE/UNCHANGED
-            4. ENHANCEMENT PRIORITY: When FLAIR and enhancement change in opposite directions, prioritize enhancement
-            
-            DECISION LOGIC:
-            - Both decreased (negative %) -> "improved"
-            - Both stable (±10%) -> "unchanged" 
-            - Either shows significant increase (>10%) -> "worse"
-            - Mixed pattern -> Follow enhancement direction
-            
-            Return JSON format:
-            {{
-                "assessment": "improved/unchanged/worse/unknown",
-                "reasoning": "explanation including volume analysis",
-                "confidence": 0.0-1.0,
-                "volume_pattern": "both_decreased/both_stable/both_increased/mixed",
-                "enhancement_priority_applied": true/false,
-                "evidence_sentences": ["relevant quotes"]
-            }}
-            """
+            prompt = (
+                f"{EXTRACTION_INSTRUCTIONS}\n"
+                "VOLUME DATA:\n"
+                f"- Baseline imaging: {baseline_date}\n"
+                f"- Follow-up imaging: {followup_date}\n"
+                f"- FLAIR volume change: {flair_change_pct}%\n"
+                f"- Enhancement volume change: {enhancement_change_pct}%\n\n"
+                f"Clinical Note:\n{clinical_note}\n"
+            )
             
             # Get LLM response
             response = await self._call_llm(prompt)
@@ -92,15 +92,15 @@ class ImagingComparisonAgent(SimpleBaseAgent):
                 response.get("evidence_sentences", [])
             )
             
-            processing_time = int((time.time() - start_time) * 1000)
+            processing_time = int((time.perf_counter() - start_time) * 1000)
             
             return AgentResult(
                 agent_id=self.agent_id,
                 patient_id=patient_id,
                 node_id="node_2_imaging_assessment",
-                timestamp=datetime.utcnow(),
+                timestamp=self._result_timestamp(context),
                 extracted_value=assessment,
-                confidence=response.get("confidence", 0.7),
+                confidence=self._get_confidence(response, 0.7),
                 reasoning=response.get("reasoning", ""),
                 source_highlights=source_highlights,
                 processing_time_ms=processing_time,
@@ -114,5 +114,5 @@ class ImagingComparisonAgent(SimpleBaseAgent):
             )
             
         except Exception as e:
-            logger.error(f"Error in ImagingComparisonAgent: {e}")
+            logger.error("Error in ImagingComparisonAgent: %s", e)
             return self._create_error_result(patient_id, str(e))
\ No newline at end of file
@@ -2,13 +2,45 @@
 from typing import Dict, Any
 import logging
 import time
-from datetime import datetime
 
 from agents.base_simple import SimpleBaseAgent
 from models.agent import AgentResult
 
 logger = logging.getLogger(__name__)
 
+EXTRACTION_INSTRUCTIONS = """\
+You are an expert medical data extractor specializing in brain tumor patient medication management.
+Your task is to extract CURRENT medication status with high precision.
+
+Extract CURRENT medication status from the clinical note.
+
+STEROID STATUS - Look for dexamethasone, decadron, prednisolone, prednisone:
+- 'none': Patient is not currently on steroids
+- 'stable': Patient continues on same steroid dose  
+- 'increasing': Steroid dose being increased/escalated
+- 'decreasing': Steroid dose being tapered/decreased
+- 'started': Patient newly started on steroids
+- 'unknown': Cannot determine from available information
+
+AVASTIN STATUS - Look for Avastin, bevacizumab, BV, anti-angiogenic therapy:
+- 'none': Patient is not on Avastin therapy
+- 'ongoing': Patient continuing established Avastin therapy
+- 'first_treatment': This is clearly the patient's first Avastin dose/cycle
+- 'started': Recently started Avastin therapy  
+- 'unknown': Cannot determine from available information
+
+Focus on CURRENT status only. Be conservative - use 'unknown' if uncertain.
+
+Return JSON format:
+{
+    "steroid_status": "none/stable/increasing/decreasing/started/unknown",
+    "avastin_status": "none/ongoing/first_treatment/started/unknown",
+    "reasoning": "explanation",
+    "confidence": 0.0-1.0,
+    "evidence_sentences": ["relevant quotes"]
+}
+"""
+
 class MedicationStatusAgent(SimpleBaseAgent):
     """Agent for extracting current medication status"""
     
@@ -21,44 +53,10 @@ class MedicationStatusAgent(SimpleBaseAgent):
     
     async def extract(self, clinical_note: str, context: Dict[str, Any], patient_id: str) -> AgentResult:
         """Extract medication status from clinical note"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             # Create prompt for medication extraction
-            prompt = f"""
-            You are an expert medical data extractor specializing in brain tumor patient medication management.
-            Your task is to extract CURRENT medication status with high precision.
-            
-            Clinical Note:
-            {clinical_note}
-            
-            Extract CURRENT medication status from the clinical note.
-            
-            STEROID STATUS - Look for dexamethasone, decadron, prednisolone, prednisone:
-            - 'none': Patient is not currently on steroids
-            - 'stable': Patient continues on same steroid dose  
-            - 'increasing': Steroid dose being increased/escalated
-            - 'decreasing': Steroid dose being tapered/decreased
-            - 'started': Patient newly started on steroids
-            - 'unknown': Cannot determine from available information
-            
-            AVASTIN STATUS - Look for Avastin, bevacizumab, BV, anti-angiogenic therapy:
-            - 'none': Patient is not on Avastin therapy
-            - 'ongoing': Patient continuing established Avastin therapy
-            - 'first_treatment': This is clearly the patient's first Avastin dose/cycle
-            - 'started': Recently started Avastin therapy  
-            - 'unknown': Cannot determine from available information
-            
-            Focus on CURRENT status only. Be conservative - use 'unknown' if uncertain.
-            
-            Return JSON format:
-            {{
-                "steroid_status": "none/stable/increasing/decreasing/started/unknown",
-                "avastin_status": "none/ongoing/first_treatment/started/unknown",
-                "reasoning": "explanation",
-                "confidence": 0.0-1.0,
-                "evidence_sentences": ["relevant quotes"]
-            }}
-            """
+            prompt = f"{EXTRACTION_INSTRUCTIONS}\nClinical Note:\n{clinical_note}\n"
             
             # Get LLM response
             response = await self._call_llm(prompt)
@@ -71,7 +69,7 @@ class MedicationStatusAgent(SimpleBaseAgent):
             
             # Calculate confidence based on how many unknowns
             unknown_count = sum(1 for v in medication_status.values() if v == "unknown")
-            confidence = response.get("confidence", 1.0 - (unknown_count * 0.4))
+            confidence = self._get_confidence(response, 1.0 - (unknown_count * 0.4))
             
             # Find source highlights
             source_highlights = await self._highlight_sources(
@@ -79,21 +77,26 @@ class MedicationStatusAgent(SimpleBaseAgent):
                 response.get("evidence_sentences", [])
             )
             
-            processing_time = int((time.time() - start_time) * 1000)
+            # Only build the fallback summary when the LLM gave no reasoning
+            reasoning = response.get("reasoning")
+            if not reasoning:
+                reasoning = f"Steroid status: {medication_status['steroid_status']}, Avastin status: {medication_status['avastin_status']}"
+            
+            processing_time = int((time.perf_counter() - start_time) * 1000)
             
             return AgentResult(
                 agent_id=self.agent_id,
                 patient_id=patient_id,
                 node_id="medication_status",
-                timestamp=datetime.utcnow(),
+                timestamp=self._result_timestamp(context),
                 extracted_value=medication_status,
                 confidence=confidence,
-                reasoning=response.get("reasoning", f"Steroid status: {medication_status['steroid_status']}, Avastin status: {medication_status['avastin_status']}"),
+                reasoning=reasoning,
                 source_highlights=source_highlights,
                 processing_time_ms=processing_time,
                 llm_model="mock-llm"
             )
             
         except Exception as e:
-            logger.error(f"Error in MedicationStatusAgent: {e}")
+            logger.error("Error in MedicationStatusAgent: %s", e)
             return self._create_error_result(patient_id, str(e))
\ No newline at end of file
@@ -2,13 +2,30 @@
 from typing import Dict, Any
 import logging
 import time
-from datetime import datetime
 
 from agents.base_simple import SimpleBaseAgent
 from models.agent import AgentResult
 
 logger = logging.getLogger(__name__)
 
+EXTRACTION_INSTRUCTIONS = """\
+Analyze the clinical note below to determine if there is suitable prior imaging for BT-RADS comparison.
+
+Look for:
+- References to prior MRI scans
+- Comparison statements
+- Baseline post-operative imaging
+- Previous follow-up studies
+
+Return JSON format:
+{
+    "has_prior": true/false,
+    "confidence": 0.0-1.0,
+    "reasoning": "explanation",
+    "evidence_sentences": ["relevant quotes"]
+}
+"""
+
 class PriorAssessmentAgent(SimpleBaseAgent):
     """Agent for determining if suitable prior imaging is available"""
     
@@ -21,29 +38,10 @@ class PriorAssessmentAgent(SimpleBaseAgent):
     
     async def extract(self, clinical_note: str, context: Dict[str, Any], patient_id: str) -> AgentResult:
         """Extract prior imaging availability from clinical note"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             # Create prompt for prior assessment
-            prompt = f"""
-            Analyze this clinical note to determine if there is suitable prior imaging for BT-RADS comparison.
-            
-            Clinical Note:
-            {clinical_note}
-            
-            Look for:
-            - References to prior MRI scans
-            - Comparison statements
-            - Baseline post-operative imaging
-            - Previous follow-up studies
-            
-            Return JSON format:
-            {{
-                "has_prior": true/false,
-                "confidence": 0.0-1.0,
-                "reasoning": "explanation",
-                "evidence_sentences": ["relevant quotes"]
-            }}
-            """
+            prompt = f"{EXTRACTION_INSTRUCTIONS}\nClinical Note:\n{clinical_note}\n"
             
             # Get LLM response
             response = await self._call_llm(prompt)
@@ -57,15 +55,15 @@ class PriorAssessmentAgent(SimpleBaseAgent):
                 response.get("evidence_sentences", [])
             )
             
-            processing_time = int((time.time() - start_time) * 1000)
+            processing_time = int((time.perf_counter() - start_time) * 1000)
             
             return AgentResult(
                 agent_id=self.agent_id,
                 patient_id=patient_id,
                 node_id="node_1_suitable_prior",
-                timestamp=datetime.utcnow(),
+                timestamp=self._result_timestamp(context),
                 extracted_value="yes" if has_prior else "no",
-                confidence=response.get("confidence", 0.7),
+                confidence=self._get_confidence(response, 0.7),
                 reasoning=response.get("reasoning", ""),
                 source_highlights=source_highlights,
                 processing_time_ms=processing_time,
@@ -73,5 +71,5 @@ class PriorAssessmentAgent(SimpleBaseAgent):
             )
             
         except Exception as e:
-            logger.error(f"Error in PriorAssessmentAgent: {e}")
+            logger.error("Error in PriorAssessmentAgent: %s", e)
             return self._create_error_result(patient_id, str(e))
\ No newline at end of file
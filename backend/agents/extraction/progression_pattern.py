@@ -2,13 +2,35 @@
 from typing import Dict, Any
 import logging
 import time
-from datetime import datetime
 
 from agents.base_simple import SimpleBaseAgent
 from models.agent import AgentResult
 
 logger = logging.getLogger(__name__)
 
+EXTRACTION_INSTRUCTIONS = """\
+Analyze the progression pattern described in the clinical note below.
+
+Task: Identify the pattern of tumor progression:
+- Infiltrative: spreading along white matter tracts, poorly defined margins
+- Expansive: mass-like growth with well-defined mass effect
+- Mixed: combination of patterns
+- CSF dissemination: leptomeningeal, subependymal or CSF space spread
+
+Return only this JSON, with no extra keys:
+{
+    "pattern_type": "infiltrative|expansive|mixed|csf_dissemination|unknown",
+    "pattern_description": "description of the pattern",
+    "progression_features": ["list of specific features mentioned"],
+    "is_infiltrative": true/false,
+    "is_expansive": true/false,
+    "involves_csf": true/false,
+    "evidence_sentences": ["list of relevant sentences"],
+    "confidence": 0.0-1.0,
+    "reasoning": "brief explanation"
+}
+"""
+
 class ProgressionPatternAgent(SimpleBaseAgent):
     """Agent responsible for analyzing progression patterns"""
     
@@ -21,42 +43,10 @@ class ProgressionPatternAgent(SimpleBaseAgent):
     
     async def extract(self, clinical_note: str, context: Dict[str, Any], patient_id: str) -> AgentResult:
         """Extract progression pattern from clinical note"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             # Create prompt for progression pattern analysis
-            prompt = f"""
-            Analyze the progression pattern described in this clinical note.
-            
-            Clinical Note:
-            {clinical_note}
-            
-            Task: Identify the pattern of tumor progression.
-            Look for:
-            - Infiltrative patterns (spreading along white matter tracts)
-            - Expansive/mass-like growth
-            - CSF dissemination or leptomeningeal involvement
-            - Subependymal spread
-            - Descriptions of how the tumor is growing or spreading
-            
-            Common patterns include:
-            - Infiltrative: spreading along white matter, poorly defined margins
-            - Expansive: well-defined mass effect, pushing boundaries
-            - Mixed: combination of patterns
-            - CSF dissemination: spread through cerebrospinal fluid spaces
-            
-            Return JSON format:
-            {{
-                "pattern_type": "infiltrative|expansive|mixed|csf_dissemination|unknown",
-                "pattern_description": "description of the pattern",
-                "progression_features": ["list of specific features mentioned"],
-                "is_infiltrative": true/false,
-                "is_expansive": true/false,
-                "involves_csf": true/false,
-                "evidence_sentences": ["list of relevant sentences"],
-                "confidence": 0.0-1.0,
-                "reasoning": "brief explanation"
-            }}
-            """
+            prompt = f"{EXTRACTION_INSTRUCTIONS}\nClinical Note:\n{clinical_note}\n"
             
             # Get LLM response
             response = await self._call_llm(prompt)
@@ -79,15 +69,15 @@ class ProgressionPatternAgent(SimpleBaseAgent):
                 response.get("evidence_sentences", [])
             )
             
-            processing_time = int((time.time() - start_time) * 1000)
+            processing_time = int((time.perf_counter() - start_time) * 1000)
             
             return AgentResult(
                 agent_id=self.agent_id,
                 patient_id=patient_id,
                 node_id="progression_pattern",
-                timestamp=datetime.utcnow(),
+                timestamp=self._result_timestamp(context),
                 extracted_value=result_data,
-                confidence=response.get("confidence", 0.7),
+                confidence=self._get_confidence(response, 0.7),
                 reasoning=response.get("reasoning", ""),
                 source_highlights=source_highlights,
                 processing_time_ms=processing_time,
@@ -95,5 +85,5 @@ class ProgressionPatternAgent(SimpleBaseAgent):
             )
             
         except Exception as e:
-            logger.error(f"Error in ProgressionPatternAgent: {e}")
+            logger.error("Error in ProgressionPatternAgent: %s", e)
             return self._create_error_result(patient_id, str(e))
\ No newline at end of file
@@ -1,7 +1,9 @@
 """Agent for extracting radiation timeline information"""
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
+from functools import lru_cache
 import logging
+import re
 import time
 
 from agents.base_simple import SimpleBaseAgent
@@ -9,6 +11,40 @@ from models.agent import AgentResult
 
 logger = logging.getLogger(__name__)
 
+# Cheap shape check so non-date LLM output never reaches fromisoformat
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}(T|$)")
+
+# (within_90_days, flowchart branch) indexed by "more than 90 days since XRT"
+_TIMING_BY_BUCKET = (
+    (True, "within_90_days"),
+    (False, "beyond_90_days"),
+)
+_TIMING_UNKNOWN = (False, "unknown")
+
+@lru_cache(maxsize=4096)
+def _parse_iso(date_str: str) -> datetime:
+    """Parse an ISO date string; follow-up dates repeat across a batch"""
+    return datetime.fromisoformat(date_str)
+
+EXTRACTION_INSTRUCTIONS = """\
+Extract radiation treatment information from the clinical note below.
+
+Task: Identify any mentions of radiation therapy, including:
+- Date of radiation treatment
+- Type of radiation (e.g., stereotactic radiosurgery, whole brain radiation)
+- Location/target of radiation
+
+Provide your response in JSON format:
+{
+    "radiation_date_str": "YYYY-MM-DD format if found",
+    "radiation_type": "type of radiation if mentioned",
+    "radiation_location": "treatment location if mentioned",
+    "evidence_sentences": ["list of sentences containing radiation info"],
+    "confidence": 0.0-1.0,
+    "reasoning": "brief explanation"
+}
+"""
+
 class RadiationTimelineAgent(SimpleBaseAgent):
     """Agent responsible for extracting radiation timeline information"""
     
@@ -21,7 +57,7 @@ class RadiationTimelineAgent(SimpleBaseAgent):
     
     async def extract(self, clinical_note: str, context: Dict[str, Any], patient_id: str) -> AgentResult:
         """Extract radiation timeline from clinical note"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             # Use Ollama for extraction
             prompt = self._create_prompt(clinical_note)
@@ -31,30 +67,35 @@ class RadiationTimelineAgent(SimpleBaseAgent):
             
             # Parse radiation date if found
             radiation_date = None
-            if extracted_data.get("radiation_date_str"):
+            radiation_date_str = extracted_data.get("radiation_date_str")
+            if radiation_date_str and _ISO_DATE.match(radiation_date_str):
                 try:
-                    radiation_date = datetime.fromisoformat(extracted_data["radiation_date_str"])
-                except:
-                    pass
+                    radiation_date = _parse_iso(radiation_date_str)
+                except ValueError:
+                    # Well-formed but not a real calendar date
+                    logger.warning("Invalid radiation date from LLM: %s", radiation_date_str)
             
-            # Calculate time since radiation
-            time_since_radiation = None
-            if radiation_date and context.get("followup_date"):
+            # Prefer the days already computed from structured patient data;
+            # only derive them from the extracted date when that's missing
+            time_since_radiation = context.get("days_since_radiation")
+            if time_since_radiation is None and radiation_date and context.get("followup_date"):
                 followup_date = context["followup_date"]
                 if isinstance(followup_date, str):
-                    followup_date = datetime.fromisoformat(followup_date)
+                    followup_date = _parse_iso(followup_date)
                 delta = followup_date - radiation_date
                 time_since_radiation = delta.days
             
             # Determine if within 90-day window
-            within_90_days = False
-            if time_since_radiation is not None:
-                within_90_days = time_since_radiation <= 90
+            within_90_days, radiation_timing = (
+                _TIMING_UNKNOWN if time_since_radiation is None
+                else _TIMING_BY_BUCKET[time_since_radiation > 90]
+            )
             
             result_data = {
                 "radiation_date": radiation_date.isoformat() if radiation_date else None,
                 "time_since_radiation_days": time_since_radiation,
                 "within_90_days": within_90_days,
+                "radiation_timing": radiation_timing,
                 "radiation_type": extracted_data.get("radiation_type"),
                 "radiation_location": extracted_data.get("radiation_location")
             }
@@ -65,15 +106,15 @@ class RadiationTimelineAgent(SimpleBaseAgent):
                 extracted_data.get("evidence_sentences", [])
             )
             
-            processing_time = int((time.time() - start_time) * 1000)
+            processing_time = int((time.perf_counter() - start_time) * 1000)
             
             return AgentResult(
                 agent_id=self.agent_id,
                 patient_id=patient_id,
                 node_id="radiation-timeline",
-                timestamp=datetime.utcnow(),
+                timestamp=self._result_timestamp(context),
                 extracted_value=result_data,
-                confidence=extracted_data.get("confidence", 0.7),
+                confidence=self._get_confidence(extracted_data, 0.7),
                 reasoning=extracted_data.get("reasoning", ""),
                 source_highlights=source_highlights,
                 processing_time_ms=processing_time,
@@ -81,32 +122,13 @@ class RadiationTimelineAgent(SimpleBaseAgent):
             )
             
         except Exception as e:
-            logger.error(f"Error in RadiationTimelineAgent: {e}")
+            logger.error("Error in RadiationTimelineAgent: %s", e)
             return self._create_error_result(patient_id, str(e))
     
     def _create_prompt(self, clinical_note: str) -> str:
         """Create prompt for radiation timeline extraction"""
-        return f"""
-        Extract radiation treatment information from this clinical note.
-        
-        Clinical Note:
-        {clinical_note}
-        
-        Task: Identify any mentions of radiation therapy, including:
-        - Date of radiation treatment
-        - Type of radiation (e.g., stereotactic radiosurgery, whole brain radiation)
-        - Location/target of radiation
-        
-        Provide your response in JSON format:
-        {{
-            "radiation_date_str": "YYYY-MM-DD format if found",
-            "radiation_type": "type of radiation if mentioned",
-            "radiation_location": "treatment location if mentioned",
-            "evidence_sentences": ["list of sentences containing radiation info"],
-            "confidence": 0.0-1.0,
-            "reasoning": "brief explanation"
-        }}
-        """
+        # Static instructions first so the backend can reuse their cached prefix
+        return f"{EXTRACTION_INSTRUCTIONS}\nClinical Note:\n{clinical_note}\n"
     
     async def validate(self, result: AgentResult, feedback: Dict[str, Any]) -> AgentResult:
         """Validate radiation timeline extraction"""
@@ -115,14 +137,18 @@ class RadiationTimelineAgent(SimpleBaseAgent):
             result.extracted_value["radiation_date"] = feedback["radiation_date"]
             
             # Recalculate time since radiation
-            if feedback["radiation_date"] and result.context.get("followup_date"):
-                radiation_date = datetime.fromisoformat(feedback["radiation_date"])
+            # Skip the recalculation for anything that isn't an ISO date
+            radiation_date_str = feedback["radiation_date"]
+            if radiation_date_str and _ISO_DATE.match(radiation_date_str) and result.context.get("followup_date"):
+                radiation_date = _parse_iso(radiation_date_str)
                 followup_date = result.context["followup_date"]
                 if isinstance(followup_date, str):
-                    followup_date = datetime.fromisoformat(followup_date)
+                    followup_date = _parse_iso(followup_date)
                 delta = followup_date - radiation_date
+                within_90_days, radiation_timing = _TIMING_BY_BUCKET[delta.days > 90]
                 result.extracted_value["time_since_radiation_days"] = delta.days
-                result.extracted_value["within_90_days"] = delta.days <= 90
+                result.extracted_value["within_90_days"] = within_90_days
+                result.extracted_value["radiation_timing"] = radiation_timing
         
         result.validation_status = "validated"
         result.validated_value = result.extracted_value
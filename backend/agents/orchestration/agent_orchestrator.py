@@ -1,9 +1,18 @@
 """Agent orchestrator for managing BT-RADS flowchart execution"""
 import asyncio
+import hashlib
+import itertools
 import logging
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Mapping, Set, Tuple
+from datetime import datetime, timezone
+from types import MappingProxyType
 
+import orjson
+
+from agents.base_simple import SimpleBaseAgent
 from agents.extraction.prior_assessment import PriorAssessmentAgent
 from agents.extraction.imaging_comparison import ImagingComparisonAgent
 from agents.extraction.medication_status import MedicationStatusAgent
@@ -15,16 +24,67 @@ from agents.extraction.progression_pattern import ProgressionPatternAgent
 from models.patient import PatientData
 from models.agent import AgentResult, ValidationStatus
 from models.btrads import BTRADSPath, BTRADSResult, BTRADSScore
+from services.agent_service import AgentService
 from services.websocket_manager import WebSocketManager
 from utils.flowchart import BTRADSFlowchart
 
 logger = logging.getLogger(__name__)
 
+# WebSocket notification coalescing
+NOTIFY_BATCH_DELAY = 0.01  # seconds
+NOTIFY_BATCH_MAX = 16
+TERMINAL_EVENTS = frozenset({"completed", "error"})
+
+# Agents whose extracted value is a dict carry their routing label in one
+# field; other dict values route through the node's "unknown" branch
+ROUTING_FIELDS = {
+    "radiation_timeline": "radiation_timing",
+}
+
+# Write-behind persistence of agent results
+WRITE_BATCH_DELAY = 0.02  # seconds
+WRITE_BATCH_MAX = 64
+WRITE_QUEUE_SIZE = 1024
+
+# Agents extracted together. Phase 1 is needed on every route and runs at
+# traversal start. The downstream agents each gate the next one (node 5 only
+# continues to node 6 on flair_and_enh, node 6 to node 7 on minor), so they
+# are extracted one at a time when the traversal actually reaches them.
+PREFETCH_PHASES = (
+    ("prior_assessment", "imaging_comparison", "medication_status", "radiation_timeline"),
+    ("component_analysis",),
+    ("extent_analysis",),
+    ("progression_pattern",),
+)
+PHASE_OF_AGENT = {name: phase for phase in PREFETCH_PHASES for name in phase}
+
+# Extraction results kept across sessions, keyed by agents + note + context hash
+EXTRACTION_CACHE_SIZE = 1024
+
+@dataclass(slots=True)
+class Session:
+    """Traversal state for one patient"""
+    data: PatientData
+    path: BTRADSPath
+    context: Mapping[str, Any]
+    auto_validate: bool
+    results: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    pending_validation: Optional[Dict[str, Any]] = None
+    agent_cache: Dict[str, AgentResult] = field(default_factory=dict)
+    result_dumps: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Running totals so the final result needs no extra passes
+    n_validated: int = 0
+    n_modified: int = 0
+    n_agents: int = 0
+    sum_confidence: float = 0.0
+    reasoning_parts: List[str] = field(default_factory=list)
+
 class AgentOrchestrator:
     """Orchestrates agent execution through BT-RADS flowchart"""
     
     def __init__(self, websocket_manager: WebSocketManager):
         self.ws_manager = websocket_manager
+        self.agent_service = AgentService()
         self.flowchart = BTRADSFlowchart()
         
         # Initialize agents
@@ -39,7 +99,54 @@ class AgentOrchestrator:
         }
         
         # Processing state
-        self.active_sessions: Dict[str, Dict[str, Any]] = {}
+        self.active_sessions: Dict[str, Session] = {}
+        self._validation_counter = itertools.count()
+        
+        # Write-behind queue for agent results, started by start()
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        
+        # Cross-session extraction cache (LRU) and in-flight extractions
+        self._extraction_cache: OrderedDict[str, Dict[str, AgentResult]] = OrderedDict()
+        self._inflight_extractions: Dict[str, asyncio.Task] = {}
+        
+        # Coalesced WebSocket notifications per patient
+        self._pending_notifications: Dict[str, List[Dict[str, Any]]] = {}
+        self._flush_tasks: Dict[str, asyncio.TimerHandle] = {}
+        # Strong references so timer-driven sends aren't garbage collected
+        self._notifier_tasks: Set[asyncio.Task] = set()
+    
+    def start(self):
+        """Start the background writer; call from a running event loop"""
+        if self._writer_task is None:
+            self._write_queue = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+            self._writer_task = asyncio.create_task(self._writer_loop())
+    
+    async def shutdown(self):
+        """Flush queued agent results and stop the background writer"""
+        if self._writer_task is None:
+            return
+        await self._write_queue.join()
+        self._writer_task.cancel()
+        self._writer_task = None
+        self._write_queue = None
+    
+    async def _writer_loop(self):
+        """Collect queued agent results into bulk inserts"""
+        queue = self._write_queue
+        while True:
+            batch = [await queue.get()]
+            # Give other patients' results a moment to join this insert
+            await asyncio.sleep(WRITE_BATCH_DELAY)
+            while len(batch) < WRITE_BATCH_MAX and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self.agent_service.save_results_bulk(batch)
+            except Exception as e:
+                logger.error("Failed to save %d agent results: %s", len(batch), e)
+            finally:
+                for _ in batch:
+                    queue.task_done()
     
     async def process_patient(
         self,
@@ -48,72 +155,104 @@ class AgentOrchestrator:
     ) -> BTRADSResult:
         """Process a patient through the BT-RADS flowchart"""
         patient_id = patient_data.patient_id
-        start_time = datetime.utcnow()
+        start_time = datetime.now(timezone.utc)
+        start_clock = time.monotonic()
         
         # Initialize session
-        self.active_sessions[patient_id] = {
-            "data": patient_data,
-            "path": BTRADSPath(patient_id=patient_id),
-            "results": {},
-            "context": self._prepare_context(patient_data),
-            "auto_validate": auto_validate
-        }
+        session = self.active_sessions[patient_id] = Session(
+            data=patient_data,
+            path=BTRADSPath(patient_id=patient_id),
+            context=self._prepare_context(patient_data),
+            auto_validate=auto_validate
+        )
         
         try:
             # Start at the root node
             await self._notify_status(patient_id, "started", {"node": "root"})
             
-            # Process through flowchart
-            final_score = await self._process_node(
-                patient_id,
-                "node_1_suitable_prior"
-            )
+            # Agents share the same note and context, so extract the ones
+            # every route needs up front
+            await self._prefetch_phase(patient_id, session, PREFETCH_PHASES[0])
+            
+            # Walk the flowchart until an outcome node yields a score
+            node_id = "node_1_suitable_prior"
+            while True:
+                node_id, final_score = await self._process_node(patient_id, session, node_id)
+                if final_score is not None:
+                    break
             
             # Create final result
-            session = self.active_sessions[patient_id]
+            completed_at = datetime.now(timezone.utc)
             result = BTRADSResult(
                 patient_id=patient_id,
                 score=final_score,
-                reasoning=self._generate_reasoning(session),
-                algorithm_path=session["path"],
-                volume_assessment=session["results"].get("imaging_comparison", {}).get("extracted_value"),
-                medication_effects=session["results"].get("medication_status", {}).get("extracted_value"),
-                time_since_radiation=session["context"].get("days_since_radiation"),
-                total_validations=len([r for r in session["results"].values() if r.get("validated")]),
-                modifications_made=len([r for r in session["results"].values() if r.get("modified")]),
-                confidence_score=self._calculate_confidence(session),
+                reasoning=" → ".join(session.reasoning_parts),
+                algorithm_path=session.path,
+                volume_assessment=session.results.get("imaging_comparison", {}).get("extracted_value"),
+                medication_effects=session.results.get("medication_status", {}).get("extracted_value"),
+                time_since_radiation=session.context.get("days_since_radiation"),
+                total_validations=session.n_validated,
+                modifications_made=session.n_modified,
+                confidence_score=(
+                    session.sum_confidence / session.n_agents if session.n_agents else 0.0
+                ),
                 started_at=start_time,
-                completed_at=datetime.utcnow(),
-                processing_duration_seconds=(datetime.utcnow() - start_time).total_seconds()
+                completed_at=completed_at,
+                processing_duration_seconds=time.monotonic() - start_clock
             )
             
+            await self._save_session_results(session)
+            
             await self._notify_status(patient_id, "completed", {"result": result.dict()})
             return result
             
         except Exception as e:
-            logger.error(f"Error processing patient {patient_id}: {str(e)}")
+            logger.error("Error processing patient %s: %s", patient_id, e)
             await self._notify_status(patient_id, "error", {"error": str(e)})
             raise
         finally:
             # Clean up session
             self.active_sessions.pop(patient_id, None)
     
+    async def process_patients(
+        self,
+        patients: List[PatientData],
+        auto_validate: bool = True,
+        max_concurrency: int = 4
+    ) -> List[Any]:
+        """Process a cohort with up to max_concurrency traversals in flight.
+        
+        Returns one entry per patient, in order: the BTRADSResult, or the
+        exception that patient's traversal raised.
+        """
+        limit = asyncio.Semaphore(max_concurrency)
+        
+        async def run(patient_data: PatientData) -> BTRADSResult:
+            async with limit:
+                return await self.process_patient(patient_data, auto_validate)
+        
+        return await asyncio.gather(
+            *(run(patient_data) for patient_data in patients),
+            return_exceptions=True
+        )
+    
     async def _process_node(
         self,
         patient_id: str,
+        session: Session,
         node_id: str
-    ) -> BTRADSScore:
-        """Process a single node in the flowchart"""
-        session = self.active_sessions[patient_id]
-        path = session["path"]
+    ) -> Tuple[Optional[str], Optional[BTRADSScore]]:
+        """Process a single node in the flowchart
         
-        # Add node to path
-        path.add_node(node_id)
+        Returns (next_node_id, None) to continue, or (None, score) at an outcome.
+        """
+        path = session.path
         
-        # Notify UI of node activation
+        # Notify UI of node activation; the node joins the path once its
+        # outcome is known
         await self._notify_status(patient_id, "node_activated", {
             "node_id": node_id,
-            "from_node": path.nodes_visited[-2] if len(path.nodes_visited) > 1 else None
+            "from_node": path.nodes_visited[-1] if path.nodes_visited else None
         })
         
         # Get node configuration
@@ -122,29 +261,38 @@ class AgentOrchestrator:
         # Handle different node types
         if node["type"] == "outcome":
             # Terminal node - return BT-RADS score
-            return BTRADSScore(node["btrads_score"])
+            path.add_node(node_id)
+            return None, BTRADSScore(node["btrads_score"])
         
         elif node["type"] == "data_extraction":
             # Run appropriate agent
-            agent_result = await self._run_agent(patient_id, node)
+            agent_result, result_dump = await self._run_agent(patient_id, session, node)
             
             # Wait for validation if needed
-            if not session["auto_validate"]:
+            if not session.auto_validate:
                 validated_value = await self._wait_for_validation(
                     patient_id,
+                    session,
                     node_id,
-                    agent_result
+                    agent_result,
+                    result_dump
                 )
             else:
                 validated_value = agent_result.extracted_value
             
             # Store result
-            session["results"][node["agent"]] = {
+            modified = validated_value != agent_result.extracted_value
+            session.results[node["agent"]] = {
                 "result": agent_result,
-                "validated": not session["auto_validate"],
+                "validated": not session.auto_validate,
                 "validated_value": validated_value,
-                "modified": validated_value != agent_result.extracted_value
+                "modified": modified
             }
+            session.n_validated += not session.auto_validate
+            session.n_modified += modified
+            session.n_agents += 1
+            session.sum_confidence += agent_result.confidence
+            session.reasoning_parts.append(f"{node['agent']}: {agent_result.reasoning}")
             
             # Determine next node based on value
             next_node = self._determine_next_node(node, validated_value)
@@ -156,77 +304,178 @@ class AgentOrchestrator:
             next_node = node["options"][decision]
             path.add_node(node_id, decision)
         
-        # Continue to next node
-        return await self._process_node(patient_id, next_node)
+        return next_node, None
+    
+    async def _prefetch_phase(
+        self,
+        patient_id: str,
+        session: Session,
+        agent_names: Tuple[str, ...]
+    ):
+        """Run a phase's extraction agents concurrently for the session.
+        
+        No agent depends on another agent's output, so the flowchart only
+        needs their values; _run_agent serves these from the agent cache.
+        """
+        agents = {
+            name: self.agents[name]
+            for name in agent_names
+            if name not in session.agent_cache
+        }
+        if not agents:
+            return
+        session.agent_cache.update(await self._extract_cached(
+            agents,
+            session.data.clinical_note,
+            session.context,
+            patient_id
+        ))
+    
+    async def _extract_cached(
+        self,
+        agents: Dict[str, SimpleBaseAgent],
+        clinical_note: str,
+        context: Mapping[str, Any],
+        patient_id: str
+    ) -> Dict[str, AgentResult]:
+        """Run agents together, reusing results for an identical note and context.
+        
+        Concurrent requests for the same key share one extraction. Batches
+        containing error results are not cached.
+        """
+        key = self._extraction_key(tuple(agents), clinical_note, context)
+        
+        results = self._extraction_cache.get(key)
+        cached = results is not None
+        if cached:
+            self._extraction_cache.move_to_end(key)
+        else:
+            task = self._inflight_extractions.get(key)
+            if task is None:
+                task = asyncio.create_task(SimpleBaseAgent.extract_batch(
+                    agents,
+                    clinical_note=clinical_note,
+                    context=context,
+                    patient_id=patient_id
+                ))
+                self._inflight_extractions[key] = task
+                task.add_done_callback(lambda _: self._inflight_extractions.pop(key, None))
+            
+            # Shield so one cancelled waiter doesn't cancel it for the others
+            results = await asyncio.shield(task)
+            if not any(self._is_error_result(r) for r in results.values()):
+                # Store a private copy; callers may edit their results in place
+                self._extraction_cache[key] = {
+                    name: result.copy(deep=True) for name, result in results.items()
+                }
+                self._extraction_cache.move_to_end(key)
+                if len(self._extraction_cache) > EXTRACTION_CACHE_SIZE:
+                    self._extraction_cache.popitem(last=False)
+        
+        # Every caller gets its own deep copy: validation edits
+        # extracted_value in place and must not leak into the cache or into
+        # another session sharing the same extraction
+        update = {"patient_id": patient_id}
+        if cached:
+            update.update(timestamp=datetime.now(timezone.utc), processing_time_ms=0)
+        return {
+            name: result.copy(deep=True, update=update)
+            for name, result in results.items()
+        }
+    
+    @staticmethod
+    def _extraction_key(
+        agent_names: Tuple[str, ...],
+        clinical_note: str,
+        context: Mapping[str, Any]
+    ) -> str:
+        """Content hash of the agent set and everything the agents read"""
+        digest = hashlib.blake2b(",".join(agent_names).encode(), digest_size=16)
+        digest.update(clinical_note.encode())
+        digest.update(orjson.dumps(dict(context), option=orjson.OPT_SORT_KEYS))
+        return digest.hexdigest()
+    
+    @staticmethod
+    def _is_error_result(result: AgentResult) -> bool:
+        """Whether an agent returned its error placeholder"""
+        return isinstance(result.extracted_value, dict) and bool(result.extracted_value.get("error"))
     
     async def _run_agent(
         self,
         patient_id: str,
+        session: Session,
         node: Dict[str, Any]
-    ) -> AgentResult:
-        """Run the appropriate agent for a node"""
-        session = self.active_sessions[patient_id]
+    ) -> Tuple[AgentResult, Dict[str, Any]]:
+        """Run the appropriate agent for a node
+        
+        Returns the result together with its serialized form, so callers
+        can notify the UI without dumping the model again.
+        """
         agent_name = node["agent"]
         
         if agent_name not in self.agents:
             raise ValueError(f"Unknown agent: {agent_name}")
         
-        agent = self.agents[agent_name]
-        
         # Notify UI of agent start
         await self._notify_status(patient_id, "agent_started", {
             "node_id": node["id"],
             "agent": agent_name
         })
         
-        # Run agent
-        result = await agent.extract(
-            clinical_note=session["data"].clinical_note,
-            context=session["context"],
-            patient_id=patient_id
-        )
+        # Note and context are fixed for the session, so a cached result
+        # (prefetched or from an earlier visit) is still valid. On a miss,
+        # extract the rest of the agent's phase along with it.
+        result = session.agent_cache.get(agent_name)
+        if result is None:
+            await self._prefetch_phase(
+                patient_id, session, PHASE_OF_AGENT.get(agent_name, (agent_name,))
+            )
+            result = session.agent_cache[agent_name]
+        
+        result_dump = session.result_dumps.get(agent_name)
+        if result_dump is None:
+            result_dump = session.result_dumps[agent_name] = result.dict()
         
         # Notify UI of completion
         await self._notify_status(patient_id, "extraction_complete", {
             "node_id": node["id"],
             "agent": agent_name,
-            "data": result.dict(),
-            "requires_validation": not session["auto_validate"]
+            "data": result_dump,
+            "requires_validation": not session.auto_validate
         })
         
-        return result
+        return result, result_dump
     
     async def _wait_for_validation(
         self,
         patient_id: str,
+        session: Session,
         node_id: str,
-        agent_result: AgentResult
+        agent_result: AgentResult,
+        result_dump: Dict[str, Any]
     ) -> Any:
         """Wait for clinician validation"""
         # Create validation request
-        validation_id = f"{patient_id}_{node_id}_{agent_result.timestamp.timestamp()}"
+        validation_id = f"{patient_id}_{node_id}_{next(self._validation_counter)}"
         
         # Store pending validation
-        session = self.active_sessions[patient_id]
-        session["pending_validation"] = {
+        session.pending_validation = {
             "id": validation_id,
             "node_id": node_id,
             "result": agent_result,
-            "event": asyncio.Event()
+            "queue": asyncio.Queue(maxsize=1)
         }
         
         # Notify UI
         await self._notify_status(patient_id, "validation_required", {
             "validation_id": validation_id,
             "node_id": node_id,
-            "agent_result": agent_result.dict()
+            "agent_result": result_dump
         })
         
-        # Wait for validation
-        await session["pending_validation"]["event"].wait()
-        
-        # Return validated value
-        return session["pending_validation"]["validated_value"]
+        # Wait for the clinician's (value, notes) handoff
+        validated_value, _notes = await session.pending_validation["queue"].get()
+        return validated_value
     
     async def validate_result(
         self,
@@ -237,19 +486,17 @@ class AgentOrchestrator:
     ):
         """Handle validation from clinician"""
         session = self.active_sessions.get(patient_id)
-        if not session or "pending_validation" not in session:
+        if not session or session.pending_validation is None:
             raise ValueError("No pending validation found")
         
-        pending = session["pending_validation"]
+        pending = session.pending_validation
         if pending["id"] != validation_id:
             raise ValueError("Validation ID mismatch")
         
-        # Store validated value
-        pending["validated_value"] = validated_value
-        pending["notes"] = notes
-        
-        # Notify waiting coroutine
-        pending["event"].set()
+        # Consume the request before handing the value over, so a duplicate
+        # submission gets "No pending validation" instead of QueueFull
+        session.pending_validation = None
+        pending["queue"].put_nowait((validated_value, notes))
         
         # Notify UI
         await self._notify_status(patient_id, "validation_complete", {
@@ -257,8 +504,12 @@ class AgentOrchestrator:
             "validated_value": validated_value
         })
     
-    def _prepare_context(self, patient_data: PatientData) -> Dict[str, Any]:
-        """Prepare context for agents"""
+    def _prepare_context(self, patient_data: PatientData) -> Mapping[str, Any]:
+        """Prepare context for agents
+        
+        Called once per session. The context is shared by every agent and
+        by result assembly, and returned read-only; agents must not mutate it.
+        """
         context = {
             "baseline_date": patient_data.baseline_date.isoformat(),
             "followup_date": patient_data.followup_date.isoformat(),
@@ -266,41 +517,59 @@ class AgentOrchestrator:
             "enhancement_change_pct": patient_data.enhancement_change_percentage,
         }
         
-        # Calculate days since radiation if available
-        if patient_data.radiation_date and patient_data.followup_date:
-            days_diff = (patient_data.followup_date - patient_data.radiation_date).days
-            context["days_since_radiation"] = days_diff
+        # Calculate days since radiation if available (followup_date is required)
+        if patient_data.radiation_date:
+            context["days_since_radiation"] = (
+                patient_data.followup_date - patient_data.radiation_date
+            ).days
         
-        return context
+        return MappingProxyType(context)
     
     def _determine_next_node(self, node: Dict[str, Any], value: Any) -> str:
         """Determine next node based on extracted value"""
-        # Map values to next nodes based on node configuration
-        return node["next_nodes"].get(str(value), node["default_next"])
+        # Map values to next nodes based on node configuration; agents
+        # almost always return string labels, so skip the str() copy
+        if isinstance(value, str):
+            key = value
+        elif isinstance(value, dict):
+            key = value.get(ROUTING_FIELDS.get(node["agent"]), "unknown")
+        else:
+            key = str(value)
+        return node["next_nodes"].get(key, node["default_next"])
     
-    def _make_decision(self, node: Dict[str, Any], session: Dict[str, Any]) -> str:
+    def _make_decision(self, node: Dict[str, Any], session: Session) -> str:
         """Make a decision at a decision node"""
         # Implement decision logic based on node configuration and session state
         # This would use the results from previous agents
         return "default"
     
-    def _generate_reasoning(self, session: Dict[str, Any]) -> str:
-        """Generate final reasoning from all agent results"""
-        reasoning_parts = []
-        for agent_name, result_data in session["results"].items():
-            if "result" in result_data:
-                reasoning_parts.append(
-                    f"{agent_name}: {result_data['result'].reasoning}"
-                )
-        return " → ".join(reasoning_parts)
-    
-    def _calculate_confidence(self, session: Dict[str, Any]) -> float:
-        """Calculate overall confidence score"""
-        confidences = []
-        for result_data in session["results"].values():
-            if "result" in result_data:
-                confidences.append(result_data["result"].confidence)
-        return sum(confidences) / len(confidences) if confidences else 0.0
+    async def _save_session_results(self, session: Session):
+        """Persist the results of every agent on the path.
+        
+        Results are queued for the background writer when it is running,
+        so completion doesn't wait on the database; otherwise they are
+        written directly in one bulk insert.
+        """
+        results = []
+        for entry in session.results.values():
+            if entry["validated"]:
+                status = ValidationStatus.MODIFIED if entry["modified"] else ValidationStatus.APPROVED
+            else:
+                status = ValidationStatus.PENDING
+            results.append(entry["result"].copy(update={
+                "validation_status": status,
+                "validated_value": entry["validated_value"]
+            }))
+        if self._write_queue is None:
+            # Same handling as the writer: a failed save is logged and must
+            # not fail a traversal that has already completed
+            try:
+                await self.agent_service.save_results_bulk(results)
+            except Exception as e:
+                logger.error("Failed to save %d agent results: %s", len(results), e)
+            return
+        for result in results:
+            await self._write_queue.put(result)
     
     async def _notify_status(
         self,
@@ -308,12 +577,45 @@ class AgentOrchestrator:
         status: str,
         data: Dict[str, Any]
     ):
-        """Send status update via WebSocket"""
+        """Queue a status update for the patient's WebSocket.
+
+        Events are coalesced into a single "batch" frame per short delay
+        window and stamped when sent; terminal events and full buffers
+        flush immediately.
+        """
+        pending = self._pending_notifications.setdefault(patient_id, [])
+        pending.append({"type": status, **data})
+        
+        if status in TERMINAL_EVENTS or len(pending) >= NOTIFY_BATCH_MAX:
+            await self._send_pending(patient_id)
+        elif patient_id not in self._flush_tasks:
+            loop = asyncio.get_running_loop()
+            self._flush_tasks[patient_id] = loop.call_later(
+                NOTIFY_BATCH_DELAY, self._flush_notifications, patient_id
+            )
+    
+    def _flush_notifications(self, patient_id: str):
+        """Timer callback that sends the patient's buffered events"""
+        self._flush_tasks.pop(patient_id, None)
+        task = asyncio.create_task(self._send_pending(patient_id))
+        self._notifier_tasks.add(task)
+        task.add_done_callback(self._notifier_tasks.discard)
+    
+    async def _send_pending(self, patient_id: str):
+        """Send all buffered events for a patient as one batch frame"""
+        timer = self._flush_tasks.pop(patient_id, None)
+        if timer:
+            timer.cancel()
+        events = self._pending_notifications.pop(patient_id, None)
+        if not events:
+            return
+        
+        # Events in one burst share a single timestamp; left as a datetime so
+        # the WebSocket encoder formats it like every other (UTC, "Z")
+        timestamp = datetime.now(timezone.utc)
+        for event in events:
+            event["timestamp"] = timestamp
         await self.ws_manager.send_to_patient(
             patient_id,
-            {
-                "type": status,
-                "timestamp": datetime.utcnow().isoformat(),
-                **data
-            }
-        )
\ No newline at end of file
+            {"type": "batch", "events": events}
+        )
@@ -1,83 +1,96 @@
 """Agent management API routes"""
-from fastapi import APIRouter, HTTPException, Query
+import asyncio
+from functools import lru_cache
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from typing import List, Optional, Dict, Any
 
 from models.agent import AgentResult
 from services.agent_service import AgentService
 
 router = APIRouter()
-agent_service = AgentService()
+
+@lru_cache
+def get_agent_service() -> AgentService:
+    """Shared AgentService, created on first use"""
+    return AgentService()
+
+# Static catalogue served by GET /list, built once at import
+_AGENTS = (
+    {
+        "id": "prior_assessment_agent",
+        "name": "Prior Assessment Agent",
+        "node": "node_1_suitable_prior",
+        "description": "Determines if suitable prior imaging is available for comparison",
+        "extraction_type": "binary",
+        "possible_values": ["yes", "no", "unknown"]
+    },
+    {
+        "id": "imaging_comparison_agent",
+        "name": "Imaging Comparison Agent",
+        "node": "node_2_imaging_assessment",
+        "description": "Compares current imaging with prior using volume data",
+        "extraction_type": "categorical",
+        "possible_values": ["improved", "unchanged", "worse", "unknown"]
+    },
+    {
+        "id": "medication_status_agent",
+        "name": "Medication Status Agent",
+        "node": "medication_status",
+        "description": "Extracts current steroid and Avastin status",
+        "extraction_type": "complex",
+        "fields": ["steroid_status", "avastin_status"]
+    },
+    {
+        "id": "radiation_timeline_agent",
+        "name": "Radiation Timeline Agent",
+        "node": "radiation_timeline",
+        "description": "Determines radiation completion date and calculates time since XRT",
+        "extraction_type": "date",
+        "output": "days_since_radiation"
+    },
+    {
+        "id": "component_analysis_agent",
+        "name": "Component Analysis Agent",
+        "node": "node_5_what_is_worse",
+        "description": "Analyzes which components (FLAIR/enhancement) are worse",
+        "extraction_type": "categorical",
+        "possible_values": ["flair_or_enh", "flair_and_enh", "unknown"]
+    },
+    {
+        "id": "extent_analysis_agent",
+        "name": "Extent Analysis Agent",
+        "node": "node_6_how_much_worse",
+        "description": "Applies 40% threshold rule for extent of worsening",
+        "extraction_type": "categorical",
+        "possible_values": ["minor", "major", "unknown"]
+    },
+    {
+        "id": "progression_pattern_agent",
+        "name": "Progression Pattern Agent",
+        "node": "node_7_progressive",
+        "description": "Determines if worsening is progressive over multiple studies",
+        "extraction_type": "binary",
+        "possible_values": ["yes", "no", "unknown"]
+    }
+)
+
+_AGENTS_PAYLOAD = {"agents": _AGENTS, "total": len(_AGENTS)}
 
 @router.get("/list")
-async def list_available_agents():
+async def list_available_agents(response: Response):
     """List all available agents and their capabilities"""
-    agents = [
-        {
-            "id": "prior_assessment_agent",
-            "name": "Prior Assessment Agent",
-            "node": "node_1_suitable_prior",
-            "description": "Determines if suitable prior imaging is available for comparison",
-            "extraction_type": "binary",
-            "possible_values": ["yes", "no", "unknown"]
-        },
-        {
-            "id": "imaging_comparison_agent",
-            "name": "Imaging Comparison Agent",
-            "node": "node_2_imaging_assessment",
-            "description": "Compares current imaging with prior using volume data",
-            "extraction_type": "categorical",
-            "possible_values": ["improved", "unchanged", "worse", "unknown"]
-        },
-        {
-            "id": "medication_status_agent",
-            "name": "Medication Status Agent",
-            "node": "medication_status",
-            "description": "Extracts current steroid and Avastin status",
-            "extraction_type": "complex",
-            "fields": ["steroid_status", "avastin_status"]
-        },
-        {
-            "id": "radiation_timeline_agent",
-            "name": "Radiation Timeline Agent",
-            "node": "radiation_timeline",
-            "description": "Determines radiation completion date and calculates time since XRT",
-            "extraction_type": "date",
-            "output": "days_since_radiation"
-        },
-        {
-            "id": "component_analysis_agent",
-            "name": "Component Analysis Agent",
-            "node": "node_5_what_is_worse",
-            "description": "Analyzes which components (FLAIR/enhancement) are worse",
-            "extraction_type": "categorical",
-            "possible_values": ["flair_or_enh", "flair_and_enh", "unknown"]
-        },
-        {
-            "id": "extent_analysis_agent",
-            "name": "Extent Analysis Agent",
-            "node": "node_6_how_much_worse",
-            "description": "Applies 40% threshold rule for extent of worsening",
-            "extraction_type": "categorical",
-            "possible_values": ["minor", "major", "unknown"]
-        },
-        {
-            "id": "progression_pattern_agent",
-            "name": "Progression Pattern Agent",
-            "node": "node_7_progressive",
-            "description": "Determines if worsening is progressive over multiple studies",
-            "extraction_type": "binary",
-            "possible_values": ["yes", "no", "unknown"]
-        }
-    ]
-    
-    return {"agents": agents, "total": len(agents)}
+    # The catalogue only changes with a deploy, so let clients reuse it
+    response.headers["Cache-Control"] = "public, max-age=60"
+    return _AGENTS_PAYLOAD
 
 @router.get("/results/{patient_id}")
 async def get_agent_results(
     patient_id: str,
     agent_id: Optional[str] = None,
     node_id: Optional[str] = None,
-    validation_status: Optional[str] = None
+    validation_status: Optional[str] = None,
+    agent_service: AgentService = Depends(get_agent_service)
 ):
     """Get agent results for a patient with optional filtering"""
     try:
@@ -96,7 +109,10 @@ async def get_agent_results(
         raise HTTPException(500, f"Error fetching results: {str(e)}")
 
 @router.get("/result/{result_id}")
-async def get_agent_result(result_id: int):
+async def get_agent_result(
+    result_id: int,
+    agent_service: AgentService = Depends(get_agent_service)
+):
     """Get a specific agent result by ID"""
     result = await agent_service.get_result_by_id(result_id)
     if not result:
@@ -106,7 +122,8 @@ async def get_agent_result(result_id: int):
 @router.post("/test/{agent_id}")
 async def test_agent(
     agent_id: str,
-    test_data: Dict[str, Any]
+    test_data: Dict[str, Any],
+    agent_service: AgentService = Depends(get_agent_service)
 ):
     """Test an agent with sample data"""
     try:
@@ -134,10 +151,43 @@ async def test_agent(
     except Exception as e:
         raise HTTPException(500, f"Agent test failed: {str(e)}")
 
+@router.post("/test/{agent_id}/batch")
+async def test_agent_batch(
+    agent_id: str,
+    test_cases: List[Dict[str, Any]],
+    agent_service: AgentService = Depends(get_agent_service)
+):
+    """Test an agent on several notes concurrently"""
+    try:
+        if any(not case.get("clinical_note") for case in test_cases):
+            raise ValueError("clinical_note is required for every test case")
+        
+        # Run all cases together so their LLM calls overlap
+        results = await asyncio.gather(*[
+            agent_service.test_agent(
+                agent_id=agent_id,
+                clinical_note=case["clinical_note"],
+                context=case.get("context", {})
+            )
+            for case in test_cases
+        ])
+        
+        return {
+            "success": True,
+            "results": results,
+            "total": len(results)
+        }
+        
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    except Exception as e:
+        raise HTTPException(500, f"Agent batch test failed: {str(e)}")
+
 @router.get("/performance/{agent_id}")
 async def get_agent_performance(
     agent_id: str,
-    days: int = Query(7, description="Number of days to analyze")
+    days: int = Query(7, description="Number of days to analyze"),
+    agent_service: AgentService = Depends(get_agent_service)
 ):
     """Get performance metrics for an agent"""
     try:
@@ -1,13 +1,14 @@
 """Patient management API routes"""
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
 from typing import List, Optional
-import pandas as pd
-import io
 
 from models.patient import Patient, PatientData
 
 router = APIRouter()
 
+# Bytes inspected before accepting an upload as CSV
+CSV_SNIFF_BYTES = 4096
+
 # Will be set by main.py
 patient_service = None
 
@@ -27,13 +28,16 @@ async def upload_patients(file: UploadFile = File(...)):
     if not file.filename.endswith('.csv'):
         raise HTTPException(400, "File must be CSV format")
     
+    # Reject binary files from the head of the upload before anything is
+    # parsed or stored; malformed text is left for read_csv to report
+    sample = await file.read(CSV_SNIFF_BYTES)
+    if b"\0" in sample:
+        raise HTTPException(400, "File must be CSV format")
+    await file.seek(0)
+    
     try:
-        # Read CSV
-        contents = await file.read()
-        df = pd.read_csv(io.StringIO(contents.decode('utf-8')))
-        
-        # Process and store patients
-        patients = await patient_service.process_csv(df)
+        # Stream the spooled upload instead of decoding it into memory at once
+        patients = await patient_service.process_csv_chunks(file.file)
         return patients
         
     except Exception as e:
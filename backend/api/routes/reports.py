@@ -1,18 +1,27 @@
 """Report generation API routes"""
-from fastapi import APIRouter, HTTPException, Response
+from fastapi import APIRouter, HTTPException, Depends, Response
 from typing import Optional
-import json
 import io
 from datetime import datetime
+from functools import lru_cache
+
+import orjson
 
 from services.report_service import ReportService
 from models.btrads import BTRADSResult
 
 router = APIRouter()
-report_service = ReportService()
+
+@lru_cache
+def get_report_service() -> ReportService:
+    """Shared ReportService, created on first use"""
+    return ReportService()
 
 @router.get("/{patient_id}/summary")
-async def get_patient_summary(patient_id: str):
+async def get_patient_summary(
+    patient_id: str,
+    report_service: ReportService = Depends(get_report_service)
+):
     """Get a summary report for a patient"""
     try:
         summary = await report_service.generate_summary(patient_id)
@@ -23,7 +32,10 @@ async def get_patient_summary(patient_id: str):
         raise HTTPException(500, f"Error generating summary: {str(e)}")
 
 @router.get("/{patient_id}/pdf")
-async def generate_pdf_report(patient_id: str):
+async def generate_pdf_report(
+    patient_id: str,
+    report_service: ReportService = Depends(get_report_service)
+):
     """Generate a PDF report for a patient"""
     try:
         pdf_bytes = await report_service.generate_pdf_report(patient_id)
@@ -39,7 +51,11 @@ async def generate_pdf_report(patient_id: str):
         raise HTTPException(500, f"Error generating PDF: {str(e)}")
 
 @router.get("/{patient_id}/export/json")
-async def export_json(patient_id: str, include_raw: bool = False):
+async def export_json(
+    patient_id: str,
+    include_raw: bool = False,
+    report_service: ReportService = Depends(get_report_service)
+):
     """Export patient results as JSON"""
     try:
         data = await report_service.export_patient_data(
@@ -48,7 +64,7 @@ async def export_json(patient_id: str, include_raw: bool = False):
         )
         
         return Response(
-            content=json.dumps(data, indent=2, default=str),
+            content=orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str),
             media_type="application/json",
             headers={
                 "Content-Disposition": f"attachment; filename=btrads_export_{patient_id}.json"
@@ -58,7 +74,10 @@ async def export_json(patient_id: str, include_raw: bool = False):
         raise HTTPException(500, f"Error exporting data: {str(e)}")
 
 @router.get("/{patient_id}/audit-trail")
-async def get_audit_trail(patient_id: str):
+async def get_audit_trail(
+    patient_id: str,
+    report_service: ReportService = Depends(get_report_service)
+):
     """Get complete audit trail for a patient"""
     try:
         audit_trail = await report_service.get_audit_trail(patient_id)
@@ -71,7 +90,10 @@ async def get_audit_trail(patient_id: str):
         raise HTTPException(500, f"Error retrieving audit trail: {str(e)}")
 
 @router.post("/batch/summary")
-async def generate_batch_summary(patient_ids: list[str]):
+async def generate_batch_summary(
+    patient_ids: list[str],
+    report_service: ReportService = Depends(get_report_service)
+):
     """Generate summary statistics for multiple patients"""
     try:
         if not patient_ids:
@@ -87,12 +109,19 @@ async def generate_batch_summary(patient_ids: list[str]):
 
 @router.get("/statistics")
 async def get_system_statistics(
+    response: Response,
     start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None,
+    report_service: ReportService = Depends(get_report_service)
 ):
     """Get system-wide statistics"""
     try:
         stats = await report_service.get_system_statistics(start_date, end_date)
+        # A range that ended in the past changes rarely; anything open-ended
+        # is only cached briefly to absorb dashboard refreshes
+        now = datetime.now(end_date.tzinfo) if end_date else None
+        max_age = 300 if end_date and end_date < now else 5
+        response.headers["Cache-Control"] = f"private, max-age={max_age}"
         return stats
     except Exception as e:
         raise HTTPException(500, f"Error calculating statistics: {str(e)}")
\ No newline at end of file
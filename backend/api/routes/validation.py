@@ -1,15 +1,23 @@
 """Validation API routes"""
 from fastapi import APIRouter, HTTPException, Depends
 from typing import Dict, Any
+from functools import lru_cache
 
 from models.agent import AgentValidationRequest
 from services.validation_service import ValidationService
 
 router = APIRouter()
-validation_service = ValidationService()
+
+@lru_cache
+def get_validation_service() -> ValidationService:
+    """Shared ValidationService, created on first use"""
+    return ValidationService()
 
 @router.post("/validate")
-async def validate_agent_result(request: AgentValidationRequest):
+async def validate_agent_result(
+    request: AgentValidationRequest,
+    validation_service: ValidationService = Depends(get_validation_service)
+):
     """Validate an agent extraction result"""
     try:
         result = await validation_service.validate_result(
@@ -29,7 +37,8 @@ async def validate_agent_result(request: AgentValidationRequest):
 async def override_decision(
     patient_id: str,
     node_id: str,
-    override_data: Dict[str, Any]
+    override_data: Dict[str, Any],
+    validation_service: ValidationService = Depends(get_validation_service)
 ):
     """Override a decision at a specific node"""
     try:
@@ -45,7 +54,10 @@ async def override_decision(
         raise HTTPException(500, f"Override error: {str(e)}")
 
 @router.get("/pending/{patient_id}")
-async def get_pending_validations(patient_id: str):
+async def get_pending_validations(
+    patient_id: str,
+    validation_service: ValidationService = Depends(get_validation_service)
+):
     """Get all pending validations for a patient"""
     pending = await validation_service.get_pending_validations(patient_id)
     return {"patient_id": patient_id, "pending_validations": pending}
\ No newline at end of file
@@ -3,12 +3,16 @@ BT-RADS Multi-Agent System - FastAPI Backend
 """
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import uvicorn
 import logging
+import os
 from typing import Dict
 import asyncio
 
+import ollama
+
 from api.routes import patients, agents, validation, reports
 from services.websocket_manager import WebSocketManager
 from services.patient_service import PatientService
@@ -32,22 +36,46 @@ patient_service.set_orchestrator(orchestrator)
 # Set patient service in routes
 patients.set_patient_service(patient_service)
 
+# Model loaded into Ollama at startup so the first extraction doesn't pay for it
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3:8b")
+LLM_WARMUP_TIMEOUT = 120  # seconds
+
+async def warm_up_llm():
+    """Load the model into Ollama; an empty prompt loads it without generating"""
+    try:
+        client = ollama.AsyncClient(host=OLLAMA_BASE_URL)
+        await asyncio.wait_for(
+            client.generate(model=OLLAMA_MODEL, prompt=""),
+            LLM_WARMUP_TIMEOUT
+        )
+        logger.info("Loaded %s into Ollama", OLLAMA_MODEL)
+    except Exception as e:
+        # Best effort: the model still loads on first use
+        logger.warning("LLM warmup failed: %s", e)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
     # Startup
     logger.info("Starting BT-RADS Multi-Agent System...")
     await init_db()
+    orchestrator.start()
+    # Warm the model in the background so startup doesn't wait on it
+    warmup_task = asyncio.create_task(warm_up_llm())
     yield
     # Shutdown
     logger.info("Shutting down...")
+    warmup_task.cancel()
+    await orchestrator.shutdown()
 
 # Create FastAPI app
 app = FastAPI(
     title="BT-RADS Multi-Agent System",
     description="Interactive graph-based UI for BT-RADS classification with multi-agent validation",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -85,7 +113,7 @@ async def websocket_endpoint(websocket: WebSocket, patient_id: str):
             await manager.process_message(patient_id, data)
     except WebSocketDisconnect:
         manager.disconnect(patient_id)
-        logger.info(f"Patient {patient_id} disconnected")
+        logger.info("Patient %s disconnected", patient_id)
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -21,8 +21,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mock patient data storage
+# Mock patient data storage; the list keeps upload order for /api/patients
+# and the index serves lookups by id
 mock_patients = []
+mock_patients_by_id = {}
+
+def _add_patient(patient: dict):
+    """Store a patient in both the list and the id index"""
+    mock_patients.append(patient)
+    # Ids are only second-resolution; the first patient stored keeps the id
+    mock_patients_by_id.setdefault(patient["id"], patient)
 
 @app.get("/")
 async def root():
@@ -43,7 +51,7 @@ async def health():
 @app.post("/api/patients/upload")
 async def upload_patients(file: UploadFile = File(...)):
     """Upload endpoint that parses CSV and creates patient records"""
-    global mock_patients
+    global mock_patients, mock_patients_by_id
     
     # Read the file content
     content = await file.read()
@@ -54,6 +62,7 @@ async def upload_patients(file: UploadFile = File(...)):
     
     # Clear existing mock patients
     mock_patients = []
+    mock_patients_by_id = {}
     
     # Column mapping (from frontend validation)
     column_mapping = {
@@ -102,7 +111,7 @@ async def upload_patients(file: UploadFile = File(...)):
         
         # Only add if we have at least patient_id and clinical_note
         if patient_data.get('patient_id') and patient_data.get('clinical_note'):
-            mock_patients.append(patient)
+            _add_patient(patient)
     
     print(f"Received file: {file.filename}")
     print(f"Parsed {len(mock_patients)} patients from CSV")
@@ -120,7 +129,7 @@ async def create_patient(patient_data: dict):
         "processing_status": "pending",
         "completed": False
     }
-    mock_patients.append(patient)
+    _add_patient(patient)
     return patient
 
 @app.get("/api/patients")
@@ -131,31 +140,31 @@ async def list_patients():
 @app.get("/api/patients/{patient_id}")
 async def get_patient(patient_id: str):
     """Get a specific patient"""
-    for patient in mock_patients:
-        if patient["id"] == patient_id:
-            return patient
-    return {"error": "Patient not found"}
+    patient = mock_patients_by_id.get(patient_id)
+    if patient is None:
+        return {"error": "Patient not found"}
+    return patient
 
 @app.post("/api/patients/{patient_id}/process")
 async def start_processing(patient_id: str):
     """Start processing a patient"""
-    for patient in mock_patients:
-        if patient["id"] == patient_id:
-            patient["processing_status"] = "processing"
-            return {"message": "Processing started", "patient_id": patient_id}
-    return {"error": "Patient not found"}
+    patient = mock_patients_by_id.get(patient_id)
+    if patient is None:
+        return {"error": "Patient not found"}
+    patient["processing_status"] = "processing"
+    return {"message": "Processing started", "patient_id": patient_id}
 
 @app.get("/api/patients/{patient_id}/status")
 async def get_status(patient_id: str):
     """Get processing status"""
-    for patient in mock_patients:
-        if patient["id"] == patient_id:
-            return {
-                "patient_id": patient_id,
-                "status": patient["processing_status"],
-                "completed": patient["completed"]
-            }
-    return {"error": "Patient not found"}
+    patient = mock_patients_by_id.get(patient_id)
+    if patient is None:
+        return {"error": "Patient not found"}
+    return {
+        "patient_id": patient_id,
+        "status": patient["processing_status"],
+        "completed": patient["completed"]
+    }
 
 if __name__ == "__main__":
     print("Starting BT-RADS Mock Backend on http://localhost:8000")
@@ -1,14 +1,20 @@
 """Agent service for managing agent operations"""
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import asyncio
 
+import orjson
+
 from utils.database import get_async_db, AgentResultRecord
 from models.agent import AgentResult
 
 class AgentService:
     """Service for managing agent operations"""
     
+    def __init__(self):
+        # Agent instances reused across test requests
+        self._test_agents: Dict[str, Any] = {}
+    
     async def get_results(
         self,
         patient_id: str,
@@ -65,6 +71,51 @@ class AgentService:
             
             return results
     
+    async def save_results_bulk(self, results: List[AgentResult]):
+        """Insert several agent results in one round-trip and transaction"""
+        if not results:
+            return
+        
+        query = """
+            INSERT INTO agent_results (
+                patient_id, agent_id, node_id, timestamp,
+                extracted_value, confidence, reasoning, source_highlights,
+                validation_status, validated_value, validator_notes,
+                missing_info, processing_time_ms, llm_model
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
+        """
+        
+        rows = [
+            (
+                result.patient_id,
+                result.agent_id,
+                result.node_id,
+                self._naive_utc(result.timestamp),
+                orjson.dumps(result.extracted_value).decode(),
+                result.confidence,
+                result.reasoning,
+                orjson.dumps([h.dict() for h in result.source_highlights]).decode(),
+                result.validation_status.value,
+                orjson.dumps(result.validated_value).decode(),
+                result.validator_notes,
+                orjson.dumps([m.dict() for m in result.missing_info]).decode(),
+                result.processing_time_ms,
+                result.llm_model
+            )
+            for result in results
+        ]
+        
+        async with get_async_db() as conn:
+            async with conn.transaction():
+                await conn.executemany(query, rows)
+    
+    @staticmethod
+    def _naive_utc(value: datetime) -> datetime:
+        """Agent timestamps are aware UTC; the column is timestamp without time zone"""
+        if value.tzinfo is None:
+            return value
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    
     async def get_result_by_id(self, result_id: int) -> Optional[AgentResult]:
         """Get a specific agent result by ID"""
         async with get_async_db() as conn:
@@ -100,23 +151,24 @@ class AgentService:
         context: Dict[str, Any]
     ) -> AgentResult:
         """Test an agent with sample data"""
-        # Import agent classes
-        from agents.extraction.prior_assessment import PriorAssessmentAgent
-        from agents.extraction.imaging_comparison import ImagingComparisonAgent
-        
-        # Map agent IDs to classes
-        agent_map = {
-            "prior_assessment_agent": PriorAssessmentAgent,
-            "imaging_comparison_agent": ImagingComparisonAgent,
-            # Add more agents as implemented
-        }
-        
-        if agent_id not in agent_map:
-            raise ValueError(f"Unknown agent: {agent_id}")
-        
-        # Create agent instance
-        agent_class = agent_map[agent_id]
-        agent = agent_class()
+        agent = self._test_agents.get(agent_id)
+        if agent is None:
+            # Import agent classes
+            from agents.extraction.prior_assessment import PriorAssessmentAgent
+            from agents.extraction.imaging_comparison import ImagingComparisonAgent
+            
+            # Map agent IDs to classes
+            agent_map = {
+                "prior_assessment_agent": PriorAssessmentAgent,
+                "imaging_comparison_agent": ImagingComparisonAgent,
+                # Add more agents as implemented
+            }
+            
+            if agent_id not in agent_map:
+                raise ValueError(f"Unknown agent: {agent_id}")
+            
+            # Create the agent once and reuse it for later requests
+            agent = self._test_agents[agent_id] = agent_map[agent_id]()
         
         # Run extraction
         result = await agent.extract(
@@ -3,7 +3,7 @@ import asyncio
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import pandas as pd
-import json
+import orjson
 import logging
 
 from sqlalchemy.orm import Session
@@ -15,6 +15,49 @@ from agents.orchestration.agent_orchestrator import AgentOrchestrator
 
 logger = logging.getLogger(__name__)
 
+# Rows parsed per DataFrame when streaming an uploaded CSV
+CSV_CHUNK_SIZE = 10_000
+
+# Keep IDs as text so values like "00123" survive parsing
+CSV_DTYPES = {col: str for col in ('patient_id', 'id', 'Patient ID', 'pid', 'PID')}
+
+CSV_DATE_COLUMNS = pd.Index(['baseline_date', 'followup_date', 'radiation_date'])
+CSV_FLOAT_COLUMNS = pd.Index([
+    'baseline_flair_volume', 'followup_flair_volume', 'flair_change_percentage',
+    'baseline_enhancement_volume', 'followup_enhancement_volume', 'enhancement_change_percentage'
+])
+
+PATIENT_LIST_COLUMNS = (
+    "id, created_at, updated_at, clinical_note, "
+    "baseline_date, followup_date, radiation_date, "
+    "baseline_flair_volume, followup_flair_volume, flair_change_percentage, "
+    "baseline_enhancement_volume, followup_enhancement_volume, enhancement_change_percentage, "
+    "ground_truth_btrads, processing_status, current_node, completed"
+)
+
+PATIENT_UPSERT_QUERY = """
+    INSERT INTO patients (
+        id, created_at, updated_at, clinical_note,
+        baseline_date, followup_date, radiation_date,
+        baseline_flair_volume, followup_flair_volume, flair_change_percentage,
+        baseline_enhancement_volume, followup_enhancement_volume, enhancement_change_percentage,
+        ground_truth_btrads, processing_status, current_node, completed
+    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17)
+    ON CONFLICT (id) DO UPDATE SET
+        updated_at = $3,
+        clinical_note = $4,
+        baseline_date = $5,
+        followup_date = $6,
+        radiation_date = $7,
+        baseline_flair_volume = $8,
+        followup_flair_volume = $9,
+        flair_change_percentage = $10,
+        baseline_enhancement_volume = $11,
+        followup_enhancement_volume = $12,
+        enhancement_change_percentage = $13,
+        ground_truth_btrads = $14
+"""
+
 class PatientService:
     """Service for managing patient data and processing"""
     
@@ -58,6 +101,20 @@ class PatientService:
         finally:
             db.close()
     
+    async def process_csv_chunks(self, source) -> List[Patient]:
+        """Parse and store an uploaded CSV one chunk at a time"""
+        loop = asyncio.get_running_loop()
+        # Parsing is blocking C code; run it off the event loop
+        reader = await loop.run_in_executor(
+            None,
+            lambda: pd.read_csv(source, chunksize=CSV_CHUNK_SIZE, dtype=CSV_DTYPES, engine="c")
+        )
+        patients = []
+        with reader:
+            while (chunk := await loop.run_in_executor(None, next, reader, None)) is not None:
+                patients.extend(await self.process_csv(chunk))
+        return patients
+    
     async def process_csv(self, df: pd.DataFrame) -> List[Patient]:
         """Process uploaded CSV file and create patient records"""
         patients = []
@@ -78,83 +135,77 @@ class PatientService:
             'ground_truth_btrads': ['ground_truth_btrads', 'BTRADS (Precise Category)', 'BT-RADS', 'Ground_Truth_BTRADS (Precise Category)', 'Ground_Truth_BTRADS (General Category)']
         }
         
-        # Normalize column names
-        normalized_df = df.copy()
+        # Normalize column names, taking the first alias present for each field
+        normalized_df = pd.DataFrame(index=df.index)
         for target_col, possible_names in column_mapping.items():
             for col_name in possible_names:
                 if col_name in df.columns:
                     normalized_df[target_col] = df[col_name]
                     break
         
-        # Process each row
-        async with get_async_db() as conn:
-            for idx, row in normalized_df.iterrows():
-                try:
-                    # Create patient data
-                    patient_data = PatientData(
-                        patient_id=str(row.get('patient_id', f'PT{idx:04d}')),
-                        clinical_note=str(row.get('clinical_note', '')),
-                        baseline_date=pd.to_datetime(row.get('baseline_date')).date(),
-                        followup_date=pd.to_datetime(row.get('followup_date')).date(),
-                        radiation_date=pd.to_datetime(row.get('radiation_date')).date() if pd.notna(row.get('radiation_date')) else None,
-                        baseline_flair_volume=float(row.get('baseline_flair_volume')) if pd.notna(row.get('baseline_flair_volume')) else None,
-                        followup_flair_volume=float(row.get('followup_flair_volume')) if pd.notna(row.get('followup_flair_volume')) else None,
-                        flair_change_percentage=float(row.get('flair_change_percentage')) if pd.notna(row.get('flair_change_percentage')) else None,
-                        baseline_enhancement_volume=float(row.get('baseline_enhancement_volume')) if pd.notna(row.get('baseline_enhancement_volume')) else None,
-                        followup_enhancement_volume=float(row.get('followup_enhancement_volume')) if pd.notna(row.get('followup_enhancement_volume')) else None,
-                        enhancement_change_percentage=float(row.get('enhancement_change_percentage')) if pd.notna(row.get('enhancement_change_percentage')) else None,
-                        ground_truth_btrads=str(row.get('ground_truth_btrads')) if pd.notna(row.get('ground_truth_btrads')) else None
-                    )
-                    
-                    # Create patient record
-                    patient = Patient(
-                        id=patient_data.patient_id,
-                        created_at=datetime.utcnow(),
-                        updated_at=datetime.utcnow(),
-                        data=patient_data,
-                        processing_status="pending",
-                        current_node=None,
-                        completed=False
-                    )
-                    
-                    # Save to database
-                    await self._save_patient(conn, patient)
-                    patients.append(patient)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing row {idx}: {str(e)}")
-                    continue
+        # Coerce whole columns at once instead of converting cell by cell;
+        # rows holding a value that fails to parse are logged and dropped.
+        # Dates are parsed per value (format='mixed') so a column mixing
+        # e.g. 2024-01-15 and 01/15/2024 is accepted as the row-wise parse was
+        invalid = pd.Series(False, index=df.index)
+        for col in CSV_DATE_COLUMNS.intersection(normalized_df.columns):
+            parsed = pd.to_datetime(normalized_df[col], errors='coerce', format='mixed')
+            invalid |= parsed.isna() & normalized_df[col].notna()
+            normalized_df[col] = parsed.dt.date
+        for col in CSV_FLOAT_COLUMNS.intersection(normalized_df.columns):
+            parsed = pd.to_numeric(normalized_df[col], errors='coerce')
+            invalid |= parsed.isna() & normalized_df[col].notna()
+            normalized_df[col] = parsed
+        
+        if 'patient_id' in normalized_df:
+            normalized_df['patient_id'] = normalized_df['patient_id'].astype(str)
+        else:
+            normalized_df['patient_id'] = [f'PT{idx:04d}' for idx in df.index]
+        if 'clinical_note' in normalized_df:
+            normalized_df['clinical_note'] = normalized_df['clinical_note'].astype(str)
+        else:
+            normalized_df['clinical_note'] = ''
+        if 'ground_truth_btrads' in normalized_df:
+            labels = normalized_df['ground_truth_btrads']
+            normalized_df['ground_truth_btrads'] = labels.astype(str).where(labels.notna())
+        
+        for idx in df.index[invalid]:
+            logger.error("Error processing row %s: unparseable date or number", idx)
+        normalized_df = normalized_df[~invalid]
+        
+        # Missing values become None for the model
+        normalized_df = normalized_df.astype(object).where(normalized_df.notna(), None)
         
-        logger.info(f"Processed {len(patients)} patients from CSV")
+        now = datetime.utcnow()
+        for idx, record in zip(normalized_df.index, normalized_df.to_dict(orient='records')):
+            try:
+                patient_data = PatientData(**record)
+            except Exception as e:
+                logger.error("Error processing row %s: %s", idx, e)
+                continue
+            
+            patients.append(Patient(
+                id=patient_data.patient_id,
+                created_at=now,
+                updated_at=now,
+                data=patient_data,
+                processing_status="pending",
+                current_node=None,
+                completed=False
+            ))
+        
+        # Save to database in one round trip
+        if patients:
+            async with get_async_db() as conn:
+                await conn.executemany(PATIENT_UPSERT_QUERY, [self._patient_row(p) for p in patients])
+        
+        logger.info("Processed %d patients from CSV", len(patients))
         return patients
     
-    async def _save_patient(self, conn, patient: Patient):
-        """Save patient to database"""
-        query = """
-            INSERT INTO patients (
-                id, created_at, updated_at, clinical_note,
-                baseline_date, followup_date, radiation_date,
-                baseline_flair_volume, followup_flair_volume, flair_change_percentage,
-                baseline_enhancement_volume, followup_enhancement_volume, enhancement_change_percentage,
-                ground_truth_btrads, processing_status, current_node, completed
-            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17)
-            ON CONFLICT (id) DO UPDATE SET
-                updated_at = $3,
-                clinical_note = $4,
-                baseline_date = $5,
-                followup_date = $6,
-                radiation_date = $7,
-                baseline_flair_volume = $8,
-                followup_flair_volume = $9,
-                flair_change_percentage = $10,
-                baseline_enhancement_volume = $11,
-                followup_enhancement_volume = $12,
-                enhancement_change_percentage = $13,
-                ground_truth_btrads = $14
-        """
-        
-        await conn.execute(
-            query,
+    @staticmethod
+    def _patient_row(patient: Patient) -> tuple:
+        """Query arguments for PATIENT_UPSERT_QUERY"""
+        return (
             patient.id,
             patient.created_at,
             patient.updated_at,
@@ -174,6 +225,10 @@ class PatientService:
             patient.completed
         )
     
+    async def _save_patient(self, conn, patient: Patient):
+        """Save patient to database"""
+        await conn.execute(PATIENT_UPSERT_QUERY, *self._patient_row(patient))
+    
     async def list_patients(
         self,
         skip: int = 0,
@@ -182,14 +237,17 @@ class PatientService:
     ) -> List[Patient]:
         """List patients with optional filtering"""
         async with get_async_db() as conn:
-            query = "SELECT * FROM patients"
+            # Only the columns the model needs (not the JSONB result), with
+            # the paging bound as parameters so the statement is reusable
+            query = f"SELECT {PATIENT_LIST_COLUMNS} FROM patients"
             params = []
             
             if status:
                 query += " WHERE processing_status = $1"
                 params.append(status)
             
-            query += f" ORDER BY created_at DESC LIMIT {limit} OFFSET {skip}"
+            query += f" ORDER BY created_at DESC LIMIT ${len(params) + 1} OFFSET ${len(params) + 2}"
+            params += [limit, skip]
             
             rows = await conn.fetch(query, *params)
             
@@ -307,8 +365,8 @@ class PatientService:
                 await conn.execute(
                     query,
                     patient_id,
-                    json.dumps(result.dict()),
-                    json.dumps(result.algorithm_path.dict()),
+                    orjson.dumps(result.dict()).decode(),
+                    orjson.dumps(result.algorithm_path.dict()).decode(),
                     datetime.utcnow()
                 )
             
@@ -1,7 +1,8 @@
 """Report generation service"""
+import asyncio
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import json
+import orjson
 from io import BytesIO
 
 from utils.database import get_async_db
@@ -31,7 +32,7 @@ class ReportService:
             result_rows = await conn.fetch(results_query, patient_id)
             
             # Parse BT-RADS result
-            btrads_result = json.loads(patient_row['btrads_result']) if patient_row['btrads_result'] else None
+            btrads_result = orjson.loads(patient_row['btrads_result']) if patient_row['btrads_result'] else None
             
             # Build summary
             summary = {
@@ -73,6 +74,14 @@ class ReportService:
         if not summary:
             raise ValueError("No results found for patient")
         
+        # Rendering is synchronous (a real PDF library would be too), so keep
+        # it off the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._render_pdf, patient_id, summary)
+    
+    @staticmethod
+    def _render_pdf(patient_id: str, summary: Dict[str, Any]) -> bytes:
+        """Render the report document for a summary (pure, no I/O)"""
         # Placeholder PDF generation
         pdf_content = f"""
 BT-RADS Assessment Report
@@ -131,8 +140,8 @@ Timeline:
                     }
                 },
                 "results": {
-                    "btrads_score": json.loads(patient_row['btrads_result'])['score'] if patient_row['btrads_result'] else None,
-                    "algorithm_path": json.loads(patient_row['algorithm_path']) if patient_row['algorithm_path'] else None,
+                    "btrads_score": orjson.loads(patient_row['btrads_result'])['score'] if patient_row['btrads_result'] else None,
+                    "algorithm_path": orjson.loads(patient_row['algorithm_path']) if patient_row['algorithm_path'] else None,
                     "completed": patient_row['completed']
                 },
                 "agent_results": [
@@ -198,11 +207,16 @@ Timeline:
     async def generate_batch_summary(self, patient_ids: List[str]) -> Dict[str, Any]:
         """Generate summary statistics for multiple patients"""
         async with get_async_db() as conn:
-            # Get completed patients
+            # Aggregate completed patients per score in the database rather
+            # than shipping and parsing every btrads_result document
             query = """
-                SELECT id, btrads_result, ground_truth_btrads
+                SELECT btrads_result->>'score' AS score,
+                       count(*) AS patients,
+                       count(*) FILTER (WHERE ground_truth_btrads <> '') AS labelled,
+                       count(*) FILTER (WHERE ground_truth_btrads = btrads_result->>'score') AS correct
                 FROM patients
                 WHERE id = ANY($1) AND completed = true
+                GROUP BY 1
             """
             
             rows = await conn.fetch(query, patient_ids)
@@ -212,19 +226,14 @@ Timeline:
             accuracy_stats = {"correct": 0, "total": 0}
             
             for row in rows:
-                if row['btrads_result']:
-                    result = json.loads(row['btrads_result'])
-                    score = result['score']
-                    score_distribution[score] = score_distribution.get(score, 0) + 1
-                    
-                    if row['ground_truth_btrads']:
-                        accuracy_stats['total'] += 1
-                        if score == row['ground_truth_btrads']:
-                            accuracy_stats['correct'] += 1
+                if row['score'] is not None:
+                    score_distribution[row['score']] = row['patients']
+                    accuracy_stats['total'] += row['labelled']
+                    accuracy_stats['correct'] += row['correct']
             
             return {
                 "total_patients": len(patient_ids),
-                "completed_patients": len(rows),
+                "completed_patients": sum(row['patients'] for row in rows),
                 "score_distribution": score_distribution,
                 "accuracy": accuracy_stats['correct'] / accuracy_stats['total'] if accuracy_stats['total'] > 0 else None,
                 "accuracy_stats": accuracy_stats
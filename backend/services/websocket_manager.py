@@ -1,11 +1,14 @@
 """WebSocket connection manager for real-time updates"""
 from typing import Dict, Any
 from fastapi import WebSocket
-import json
+import orjson
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Payload datetimes mix naive UTC (utcnow) and aware UTC; emit both as "...Z"
+JSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
 class WebSocketManager:
     """Manages WebSocket connections for real-time updates"""
     
@@ -17,7 +20,7 @@ class WebSocketManager:
         """Accept a new WebSocket connection"""
         await websocket.accept()
         self.active_connections[patient_id] = websocket
-        logger.info(f"WebSocket connected for patient {patient_id}")
+        logger.info("WebSocket connected for patient %s", patient_id)
         
         # Send initial connection confirmation
         await self.send_to_patient(patient_id, {
@@ -29,26 +32,28 @@ class WebSocketManager:
         """Remove a WebSocket connection"""
         if patient_id in self.active_connections:
             del self.active_connections[patient_id]
-            logger.info(f"WebSocket disconnected for patient {patient_id}")
+            logger.info("WebSocket disconnected for patient %s", patient_id)
     
     async def send_to_patient(self, patient_id: str, data: Dict[str, Any]):
         """Send data to a specific patient's WebSocket"""
         if patient_id in self.active_connections:
             websocket = self.active_connections[patient_id]
             try:
-                await websocket.send_json(data)
+                await websocket.send_text(orjson.dumps(data, option=JSON_OPTIONS).decode())
             except Exception as e:
-                logger.error(f"Error sending to patient {patient_id}: {str(e)}")
+                logger.error("Error sending to patient %s: %s", patient_id, e)
                 self.disconnect(patient_id)
     
     async def broadcast(self, data: Dict[str, Any]):
         """Broadcast data to all connected clients"""
+        # Encode once for every recipient
+        payload = orjson.dumps(data, option=JSON_OPTIONS).decode()
         disconnected = []
         for patient_id, websocket in self.active_connections.items():
             try:
-                await websocket.send_json(data)
+                await websocket.send_text(payload)
             except Exception as e:
-                logger.error(f"Error broadcasting to patient {patient_id}: {str(e)}")
+                logger.error("Error broadcasting to patient %s: %s", patient_id, e)
                 disconnected.append(patient_id)
         
         # Clean up disconnected clients
@@ -58,7 +63,7 @@ class WebSocketManager:
     async def process_message(self, patient_id: str, message: str):
         """Process incoming WebSocket message"""
         try:
-            data = json.loads(message)
+            data = orjson.loads(message)
             message_type = data.get("type")
             
             # Handle different message types
@@ -68,10 +73,10 @@ class WebSocketManager:
                 # This would be handled by the orchestrator
                 pass
             else:
-                logger.warning(f"Unknown message type from {patient_id}: {message_type}")
+                logger.warning("Unknown message type from %s: %s", patient_id, message_type)
                 
-        except json.JSONDecodeError:
-            logger.error(f"Invalid JSON from patient {patient_id}: {message}")
+        except orjson.JSONDecodeError:
+            logger.error("Invalid JSON from patient %s: %s", patient_id, message)
     
     def get_connection_count(self) -> int:
         """Get the number of active connections"""
@@ -220,9 +220,10 @@ class BTRADSFlowchart:
     
     def get_node(self, node_id: str) -> Dict[str, Any]:
         """Get a specific node configuration"""
-        if node_id not in self.nodes:
-            raise ValueError(f"Unknown node: {node_id}")
-        return self.nodes[node_id]
+        try:
+            return self.nodes[node_id]
+        except KeyError:
+            raise ValueError(f"Unknown node: {node_id}") from None
     
     def get_next_node(self, current_node_id: str, decision: str) -> str:
         """Get the next node based on current node and decision"""
@@ -6,6 +6,45 @@ from sentence_transformers import SentenceTransformer
 import nltk
 from nltk.tokenize import sent_tokenize
 
+# Common date patterns, fused into one alternation so the text is scanned once
+DATE_PATTERN = re.compile(
+    '|'.join(f'(?:{p})' for p in [
+        r'\d{4}-\d{1,2}-\d{1,2}',    # YYYY-MM-DD
+        r'\d{1,2}/\d{1,2}/\d{2,4}',  # MM/DD/YYYY or M/D/YY
+        r'\d{1,2}-\d{1,2}-\d{2,4}',  # MM-DD-YYYY
+        r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2},? \d{4}',  # Month DD, YYYY
+        r'\d{1,2} (?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4}',     # DD Month YYYY
+    ]),
+    re.IGNORECASE
+)
+
+# Medication patterns, one named group per medication type
+MEDICATION_PATTERN = re.compile(
+    '|'.join(f'(?P<{med_type}>{"|".join(patterns)})' for med_type, patterns in {
+        'steroids': [
+            r'dexamethasone',
+            r'decadron',
+            r'prednisolone',
+            r'prednisone',
+            r'corticosteroid[s]?',
+            r'steroid[s]?'
+        ],
+        'avastin': [
+            r'avastin',
+            r'bevacizumab',
+            r'anti[-\s]?angiogenic',
+            r'VEGF inhibitor'
+        ]
+    }.items()),
+    re.IGNORECASE
+)
+
+# Pattern for volume measurements
+VOLUME_PATTERN = re.compile(r'(\d+\.?\d*)\s*(mL|ml|cc|cm3|cm³)')
+
+# Pattern for percentage changes
+PERCENT_PATTERN = re.compile(r'([+-]?\d+\.?\d*)\s*%')
+
 # Download required NLTK data
 try:
     nltk.data.find('tokenizers/punkt')
@@ -100,25 +139,11 @@ def extract_date_mentions(text: str) -> List[Tuple[str, int, int]]:
     
     Returns: List of (date_string, start_char, end_char)
     """
-    # Common date patterns
-    patterns = [
-        r'\d{1,2}/\d{1,2}/\d{2,4}',  # MM/DD/YYYY or M/D/YY
-        r'\d{1,2}-\d{1,2}-\d{2,4}',  # MM-DD-YYYY
-        r'\d{4}-\d{1,2}-\d{1,2}',    # YYYY-MM-DD
-        r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2},? \d{4}',  # Month DD, YYYY
-        r'\d{1,2} (Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4}',     # DD Month YYYY
+    # Matches are non-overlapping and already in position order
+    return [
+        (match.group(), match.start(), match.end())
+        for match in DATE_PATTERN.finditer(text)
     ]
-    
-    results = []
-    for pattern in patterns:
-        for match in re.finditer(pattern, text, re.IGNORECASE):
-            results.append((match.group(), match.start(), match.end()))
-    
-    # Remove duplicates and sort by position
-    results = list(set(results))
-    results.sort(key=lambda x: x[1])
-    
-    return results
 
 def extract_medication_mentions(text: str) -> List[Tuple[str, str, int, int]]:
     """
@@ -126,34 +151,10 @@ def extract_medication_mentions(text: str) -> List[Tuple[str, str, int, int]]:
     
     Returns: List of (medication_type, mention_text, start_char, end_char)
     """
-    medications = {
-        'steroids': [
-            r'dexamethasone',
-            r'decadron',
-            r'prednisolone',
-            r'prednisone',
-            r'steroid[s]?',
-            r'corticosteroid[s]?'
-        ],
-        'avastin': [
-            r'avastin',
-            r'bevacizumab',
-            r'anti[-\s]?angiogenic',
-            r'VEGF inhibitor'
-        ]
-    }
-    
-    results = []
-    for med_type, patterns in medications.items():
-        for pattern in patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                results.append((med_type, match.group(), match.start(), match.end()))
-    
-    # Remove duplicates
-    results = list(set(results))
-    results.sort(key=lambda x: x[2])
-    
-    return results
+    return [
+        (match.lastgroup, match.group(), match.start(), match.end())
+        for match in MEDICATION_PATTERN.finditer(text)
+    ]
 
 def extract_volume_mentions(text: str) -> List[Tuple[str, float, str, int, int]]:
     """
@@ -161,22 +162,16 @@ def extract_volume_mentions(text: str) -> List[Tuple[str, float, str, int, int]]
     
     Returns: List of (type, value, unit, start_char, end_char)
     """
-    # Pattern for volume measurements
-    volume_pattern = r'(\d+\.?\d*)\s*(mL|ml|cc|cm3|cm³)'
-    
-    # Pattern for percentage changes
-    percent_pattern = r'([+-]?\d+\.?\d*)\s*%'
-    
     results = []
     
     # Extract volumes
-    for match in re.finditer(volume_pattern, text):
+    for match in VOLUME_PATTERN.finditer(text):
         value = float(match.group(1))
         unit = match.group(2)
         results.append(('volume', value, unit, match.start(), match.end()))
     
     # Extract percentages
-    for match in re.finditer(percent_pattern, text):
+    for match in PERCENT_PATTERN.finditer(text):
         value = float(match.group(1))
         results.append(('percentage', value, '%', match.start(), match.end()))
     
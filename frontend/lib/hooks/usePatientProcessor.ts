@@ -57,8 +57,16 @@ export function usePatientProcessor(patientId: string) {
   useEffect(() => {
     if (!lastMessage) return
     
-    const data = JSON.parse(lastMessage)
+    const message = JSON.parse(lastMessage)
+    // The backend coalesces status updates into batch frames
+    const events = message.type === 'batch' ? message.events : [message]
     
+    for (const data of events) {
+      handleEvent(data)
+    }
+  }, [lastMessage, store])
+  
+  const handleEvent = (data: any) => {
     switch (data.type) {
       case 'node_activated':
         store.setActiveNode(data.node_id)
@@ -93,7 +101,7 @@ export function usePatientProcessor(patientId: string) {
         processingRef.current = false
         break
     }
-  }, [lastMessage, store])
+  }
   
   // Start processing
   const startProcessing = useCallback(async (autoValidate = false) => {
@@ -51,7 +51,7 @@ pip install -r requirements.txt
 
 # Start FastAPI in background
 echo "Starting FastAPI server on http://localhost:8000..."
-uvicorn main:app --reload --host 0.0.0.0 --port 8000 &
+uvicorn main:app --reload --host 0.0.0.0 --port 8000 --loop uvloop --http httptools &
 BACKEND_PID=$!
 
 # Wait for backend to start